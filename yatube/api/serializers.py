@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db.models import Count
+
+# Поле ответа -> выражение для values(): словари вместо экземпляров
+# моделей и только те JOIN, которые нужны запрошенным полям.
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+    'comments_count': Count('comments'),
+}
+DEFAULT_POST_FIELDS = (
+    'id', 'text', 'pub_date', 'author', 'group', 'image',
+)
+CURSOR_FIELDS = ('id', 'pub_date')
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(request, default=DEFAULT_POST_FIELDS):
+    """Разбирает ?fields=id,text; без параметра — поля по умолчанию."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(default)
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = set(fields) - set(POST_FIELDS)
+    if unknown:
+        raise InvalidFields(', '.join(sorted(unknown)))
+    return fields
+
+
+def post_values(queryset, fields):
+    """values()-выборка постов: курсорные поля добавляются всегда."""
+    columns = {}
+    annotations = {}
+    for name in set(fields) | set(CURSOR_FIELDS):
+        expression = POST_FIELDS[name]
+        if isinstance(expression, str):
+            columns[name] = expression
+        else:
+            annotations[name] = expression
+    queryset = queryset.annotate(**annotations) if annotations else queryset
+    return queryset.values(*columns.values(), *annotations)
+
+
+def serialize_post(row, fields):
+    data = {}
+    for name in fields:
+        expression = POST_FIELDS[name]
+        value = row[expression if isinstance(expression, str) else name]
+        if name == 'pub_date':
+            value = value.isoformat()
+        elif name == 'image':
+            value = settings.MEDIA_URL + value if value else None
+        data[name] = value
+    return data
+
+
+COMMENT_FIELDS = ('id', 'text', 'created', 'author__username', 'post_id')
+FOLLOW_FIELDS = ('id', 'user__username', 'author__username')
+
+
+def serialize_comment(row):
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'created': row['created'].isoformat(),
+        'author': row['author__username'],
+        'post': row['post_id'],
+    }
+
+
+def serialize_follow(row):
+    return {
+        'id': row['id'],
+        'user': row['user__username'],
+        'author': row['author__username'],
+    }
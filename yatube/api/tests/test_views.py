@@ -0,0 +1,228 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.changes import compact
+from posts.events import ChangeBroker
+from posts.models import Change, Comment, Follow, Group, Post, User
+
+
+@override_settings(API_PAGE_SIZE=5)
+class ApiFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=cls.author, group=cls.group)
+            for i in range(12)
+        )
+        cls.post = Post.objects.first()
+        Comment.objects.create(text='Комментарий', author=cls.reader,
+                               post=cls.post)
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def collect(self, client, url):
+        '''Проходит ленту по курсорам и возвращает все id.'''
+        ids, cursor = [], None
+        while True:
+            params = {'cursor': cursor} if cursor else {}
+            data = client.get(url, params).json()
+            ids.extend(post['id'] for post in data['results'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                return ids
+
+    def test_cursor_pagination_covers_feeds(self):
+        expected = list(
+            Post.objects.order_by('-pub_date', '-pk')
+            .values_list('id', flat=True)
+        )
+        urls = (
+            reverse('api:index'),
+            reverse('api:group_list', kwargs={'slug': self.group.slug}),
+            reverse('api:profile', kwargs={'username': self.author}),
+            reverse('api:follow_index'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.collect(self.reader_client, url),
+                                 expected)
+
+    def test_sparse_fields(self):
+        response = self.guest_client.get(
+            reverse('api:post_detail', kwargs={'post_id': self.post.id}),
+            {'fields': 'id,author,comments_count'}
+        )
+        self.assertEqual(response.json(), {
+            'id': self.post.id, 'author': 'auth', 'comments_count': 1,
+        })
+        response = self.guest_client.get(reverse('api:index'),
+                                         {'fields': 'password'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_bad_cursor(self):
+        response = self.guest_client.get(reverse('api:index'),
+                                         {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_etag(self):
+        url = reverse('api:index')
+        etag = self.guest_client.get(url)['ETag']
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_follow_requires_auth(self):
+        response = self.guest_client.get(reverse('api:follow_index'))
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+
+
+class ApiBatchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.posts = [
+            Post.objects.create(text=f'Пост {i}', author=cls.author)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.url = reverse('api:posts_batch')
+
+    def ids(self, *pks):
+        return {'ids': ','.join(str(pk) for pk in pks)}
+
+    def test_batch_keeps_order_and_reports_missing(self):
+        first, second, _ = self.posts
+        response = self.guest_client.get(
+            self.url, self.ids(second.id, 10 ** 6, first.id)
+        )
+        data = response.json()
+        self.assertEqual([post['id'] for post in data['results']],
+                         [second.id, first.id])
+        self.assertEqual(data['not_found'], [10 ** 6])
+
+    def test_batch_uses_object_cache(self):
+        pks = [post.id for post in self.posts]
+        with self.assertNumQueries(1):
+            self.guest_client.get(self.url, self.ids(*pks))
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.url, self.ids(*pks))
+
+    def test_comment_invalidates_cached_post(self):
+        post = self.posts[0]
+        params = {**self.ids(post.id), 'fields': 'comments_count'}
+        self.guest_client.get(self.url, params)
+        Comment.objects.create(text='Комментарий', author=self.author,
+                               post=post)
+        response = self.guest_client.get(self.url, params)
+        self.assertEqual(response.json()['results'],
+                         [{'comments_count': 1}])
+
+    @override_settings(API_BATCH_LIMIT=2)
+    def test_batch_limit(self):
+        response = self.guest_client.get(
+            self.url, self.ids(*[post.id for post in self.posts])
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+
+@mock.patch.object(ChangeBroker, 'start')
+class ApiChangesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.url = reverse('api:changes')
+
+    def sync(self, since):
+        return self.reader_client.get(self.url, {'since': since}).json()
+
+    def test_changes_since(self, start):
+        since = self.sync(0)['last_seq']
+        post = Post.objects.create(author=self.author, text='Пост')
+        comment = Comment.objects.create(author=self.reader, post=post,
+                                         text='Комментарий')
+        Follow.objects.create(user=self.author, author=self.reader)
+        follow = Follow.objects.create(user=self.reader, author=self.author)
+        post_id = post.id
+        post.delete()
+        data = self.sync(since)
+        self.assertEqual(
+            [(change['model'], change['action'], change['id'])
+             for change in data['changes']],
+            [
+                (Change.POST, Change.CREATED, post_id),
+                (Change.COMMENT, Change.CREATED, comment.id),
+                (Change.FOLLOW, Change.CREATED, follow.id),
+                (Change.COMMENT, Change.DELETED, comment.id),
+                (Change.POST, Change.DELETED, post_id),
+            ]
+        )
+        self.assertEqual(data['changes'][2]['data']['author'], 'auth')
+        self.assertIsNone(data['changes'][0]['data'])
+        self.assertEqual(self.sync(data['last_seq'])['changes'], [])
+
+    def test_long_poll_times_out(self, start):
+        since = self.sync(0)['last_seq']
+        response = self.reader_client.get(
+            self.url, {'since': since, 'timeout': 0.05}
+        )
+        self.assertEqual(response.json()['changes'], [])
+
+    def test_compaction(self, start):
+        post = Post.objects.create(author=self.author, text='Пост')
+        for text in ('Правка', 'Ещё правка'):
+            post.text = text
+            post.save()
+        first = Change.objects.first().pk
+        expired, superseded = compact(keep_days=1)
+        self.assertEqual((expired, superseded), (0, 1))
+        self.assertFalse(self.sync(first - 1)['reset'])
+        Change.objects.update(created=timezone.now() - timedelta(days=2))
+        Post.objects.create(author=self.author, text='Новый пост')
+        compact(keep_days=1)
+        self.assertTrue(self.sync(first - 1)['reset'])
+
+    def test_client_resumes_after_reset(self, start):
+        post = Post.objects.create(author=self.author, text='Пост')
+        post.text = 'Правка'
+        post.save()
+        Change.objects.update(created=timezone.now() - timedelta(days=2))
+        Post.objects.create(author=self.author, text='Новый пост')
+        compact(keep_days=1)
+        data = self.sync(0)
+        self.assertTrue(data['reset'])
+        self.assertEqual(data['last_seq'], Change.objects.last().pk)
+        data = self.sync(data['last_seq'])
+        self.assertFalse(data['reset'])
+        self.assertEqual(data['changes'], [])
+        newest = Post.objects.create(author=self.author, text='После сброса')
+        data = self.sync(data['last_seq'])
+        self.assertFalse(data['reset'])
+        self.assertEqual([change['id'] for change in data['changes']],
+                         [newest.id])
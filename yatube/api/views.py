@@ -0,0 +1,250 @@
+import hashlib
+import json
+from collections import defaultdict
+from functools import partial, wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max, Q
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+
+from posts.cache import post_key
+from posts.changes import needs_reset
+from posts.events import wait_for_changes
+from posts.models import Change, Comment, Follow, Group, Post, User
+from posts.paginators import CursorPaginator, InvalidCursor
+
+from .serializers import (COMMENT_FIELDS, DEFAULT_POST_FIELDS,
+                          FOLLOW_FIELDS, POST_FIELDS, InvalidFields,
+                          parse_fields, post_values, serialize_comment,
+                          serialize_follow, serialize_post)
+
+
+def error(message, status=HTTPStatus.BAD_REQUEST):
+    return JsonResponse({'error': message}, status=status)
+
+
+def json_response(request, data):
+    """JSON-ответ с ETag; повторный запрос с If-None-Match получает 304."""
+    body = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+    etag = '"{}"'.format(hashlib.md5(body.encode()).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Vary'] = 'Cookie'
+    return response
+
+
+def api_view(view):
+    """GET-only, ошибки курсора и полей превращаются в 400."""
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except InvalidFields as fields:
+            return error(f'Неизвестные поля: {fields}')
+        except InvalidCursor:
+            return error('Некорректный курсор')
+    return wrapper
+
+
+def api_login_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return error('Требуется авторизация', HTTPStatus.UNAUTHORIZED)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def paginated_posts(request, queryset, extra=None):
+    fields = parse_fields(request)
+    paginator = CursorPaginator(
+        post_values(queryset, fields), settings.API_PAGE_SIZE
+    )
+    page = paginator.page(request.GET.get('cursor'))
+    data = dict(extra or {})
+    data['results'] = [serialize_post(row, fields) for row in page]
+    data['next_cursor'] = page.next_cursor
+    return json_response(request, data)
+
+
+@api_view
+def index(request):
+    return paginated_posts(request, Post.objects.all())
+
+
+@api_view
+def group_posts(request, slug):
+    group = get_object_or_404(
+        Group.objects.values('id', 'title', 'slug', 'description'),
+        slug=slug
+    )
+    return paginated_posts(
+        request,
+        Post.objects.filter(group_id=group.pop('id')),
+        {'group': group}
+    )
+
+
+@api_view
+def profile(request, username):
+    author = get_object_or_404(
+        User.objects.values('id', 'username', 'first_name', 'last_name'),
+        username=username
+    )
+    return paginated_posts(
+        request,
+        Post.objects.filter(author_id=author.pop('id')),
+        {'author': author}
+    )
+
+
+@api_view
+@api_login_required
+def follow_index(request):
+    return paginated_posts(
+        request, Post.objects.filter(author__following__user=request.user)
+    )
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = parse_fields(request)
+    row = get_object_or_404(
+        post_values(Post.objects.all(), fields), pk=post_id
+    )
+    return json_response(request, serialize_post(row, fields))
+
+
+def parse_ids(request):
+    try:
+        ids = [int(pk) for pk in request.GET.get('ids', '').split(',') if pk]
+    except ValueError:
+        return None
+    return list(dict.fromkeys(ids))
+
+
+@api_view
+def posts_batch(request):
+    """Несколько постов по ?ids=1,2,3 за один запрос к базе.
+
+    Полные записи постов берутся из кеша объектов, из базы одним
+    запросом с JOIN и подсчётом комментариев дочитываются только
+    недостающие, и они же кладутся в кеш.
+    """
+    fields = parse_fields(request)
+    ids = parse_ids(request)
+    if not ids:
+        return error('Передайте id постов: ?ids=1,2,3')
+    if len(ids) > settings.API_BATCH_LIMIT:
+        return error(
+            f'Не больше {settings.API_BATCH_LIMIT} постов за запрос'
+        )
+    keys = {pk: post_key(pk) for pk in ids}
+    cached = cache.get_many(keys.values())
+    found = {pk: cached[key] for pk, key in keys.items() if key in cached}
+    missing = [pk for pk in ids if pk not in found]
+    if missing:
+        rows = post_values(Post.objects.filter(pk__in=missing), POST_FIELDS)
+        fetched = {
+            row['id']: serialize_post(row, POST_FIELDS) for row in rows
+        }
+        cache.set_many(
+            {keys[pk]: post for pk, post in fetched.items()},
+            settings.API_OBJECT_CACHE_TIMEOUT
+        )
+        found.update(fetched)
+    return json_response(request, {
+        'results': [
+            {name: found[pk][name] for name in fields}
+            for pk in ids if pk in found
+        ],
+        'not_found': [pk for pk in ids if pk not in found],
+    })
+
+
+def changed_objects(changes):
+    """Текущее состояние созданных и изменённых объектов, по модели."""
+    ids = defaultdict(set)
+    for change in changes:
+        if change['action'] != Change.DELETED:
+            ids[change['model']].add(change['object_id'])
+    sources = {
+        Change.POST: (
+            post_values(Post.objects.all(), DEFAULT_POST_FIELDS),
+            partial(serialize_post, fields=DEFAULT_POST_FIELDS),
+        ),
+        Change.COMMENT: (
+            Comment.objects.values(*COMMENT_FIELDS), serialize_comment
+        ),
+        Change.FOLLOW: (
+            Follow.objects.values(*FOLLOW_FIELDS), serialize_follow
+        ),
+    }
+    objects = {}
+    for model, pks in ids.items():
+        queryset, serialize = sources[model]
+        objects[model] = {
+            row['id']: serialize(row) for row in queryset.filter(pk__in=pks)
+        }
+    return objects
+
+
+@api_view
+def changes(request):
+    """Изменения постов, комментариев и своих подписок после ?since=.
+
+    Если изменений нет, запрос ждёт их до ?timeout= секунд. Ответ с
+    reset=true значит, что журнал уже сжат дальше since: клиенту нужно
+    заново загрузить ленты и продолжить с last_seq — текущего конца
+    журнала.
+    """
+    try:
+        since = int(request.GET.get('since', 0))
+        timeout = min(float(request.GET.get('timeout', 0)),
+                      settings.CHANGES_MAX_WAIT)
+    except ValueError:
+        return error('since и timeout должны быть числами')
+    if needs_reset(since):
+        head = Change.objects.aggregate(head=Max('pk'))['head'] or 0
+        return json_response(request, {
+            'reset': True, 'changes': [], 'last_seq': head,
+        })
+    visible = Q(model__in=(Change.POST, Change.COMMENT))
+    if request.user.is_authenticated:
+        visible |= Q(model=Change.FOLLOW, parent_id=request.user.id)
+    queryset = (
+        Change.objects.filter(visible, pk__gt=since)
+        .values('id', 'model', 'action', 'object_id')
+    )
+
+    def fetch():
+        return list(queryset[:settings.CHANGES_PAGE_SIZE + 1])
+
+    rows = wait_for_changes(fetch, timeout)
+    has_more = len(rows) > settings.CHANGES_PAGE_SIZE
+    rows = rows[:settings.CHANGES_PAGE_SIZE]
+    objects = changed_objects(rows) if rows else {}
+    return json_response(request, {
+        'reset': False,
+        'changes': [
+            {
+                'seq': row['id'],
+                'model': row['model'],
+                'action': row['action'],
+                'id': row['object_id'],
+                'data': objects.get(row['model'], {}).get(row['object_id']),
+            }
+            for row in rows
+        ],
+        'last_seq': rows[-1]['id'] if rows else since,
+        'has_more': has_more,
+    })
@@ -1,5 +1,21 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_finished
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .auth import invalidate_user
+        from .slow_queries import on_connection_created
+        connection_created.connect(on_connection_created)
+        post_save.connect(invalidate_user, sender=get_user_model())
+        post_delete.connect(invalidate_user, sender=get_user_model())
+        if settings.TEMPLATE_PROFILER['ENABLED']:
+            from . import template_profiler
+            template_profiler.install()
+            request_finished.connect(template_profiler.dump)
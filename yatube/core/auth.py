@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def user_key(pk):
+    return f'auth:user:{pk}'
+
+
+def get_user(request):
+    """auth.get_user, но пользователь берётся из кеша.
+
+    Проверки те же, что в django.contrib.auth: бэкенд из сессии должен
+    быть в AUTHENTICATION_BACKENDS, хеш сессии — совпадать с хешем
+    пароля, иначе сессия сбрасывается.
+    """
+    try:
+        pk = request.session[auth.SESSION_KEY]
+        backend = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    key = user_key(pk)
+    user = cache.get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(key, user, settings.AUTH_CACHE['TIMEOUT'])
+        return user
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not (session_hash and constant_time_compare(
+            session_hash, user.get_session_auth_hash())):
+        request.session.flush()
+        return AnonymousUser()
+    return user
+
+
+def invalidate_user(sender, instance, **kwargs):
+    cache.delete(user_key(instance.pk))
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware без запроса к auth_user на каждый запрос.
+
+    Запись пользователя удаляется из кеша при любом сохранении или
+    удалении User: смене пароля, правке профиля, обновлении last_login.
+    С AUTH_CACHE['ENABLED'] = False работает как стандартная.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        if settings.AUTH_CACHE['ENABLED']:
+            request.user = SimpleLazyObject(lambda: get_user(request))
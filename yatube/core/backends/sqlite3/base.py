@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+def apply_pragmas(connection, pragmas):
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с настройками из SQLITE_PRAGMAS на каждом соединении.
+
+    WAL позволяет читать во время записи, а при CONN_MAX_AGE > 0
+    соединение и его настроенный кеш страниц живут между запросами.
+    PRAGMA optimize выполняется не реже SQLITE_OPTIMIZE_INTERVAL секунд
+    и при закрытии соединения, как советует документация SQLite.
+    """
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, settings.SQLITE_PRAGMAS)
+        self.optimized_at = time.monotonic()
+        return connection
+
+    def optimize(self):
+        """PRAGMA optimize без ожидания блокировки и без ошибок.
+
+        Вызывается между запросами: если базу держит писатель, ANALYZE
+        откладывается до следующего раза, а не ждёт busy_timeout.
+        """
+        self.optimized_at = time.monotonic()
+        busy_timeout = self.connection.execute(
+            'PRAGMA busy_timeout'
+        ).fetchone()[0]
+        self.connection.execute('PRAGMA busy_timeout = 0')
+        try:
+            self.connection.execute('PRAGMA optimize')
+        except base.Database.Error:
+            pass
+        finally:
+            self.connection.execute(f'PRAGMA busy_timeout = {busy_timeout}')
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        if (self.connection is not None
+                and not self.in_atomic_block
+                and time.monotonic() - self.optimized_at
+                >= settings.SQLITE_OPTIMIZE_INTERVAL):
+            self.optimize()
+
+    def _close(self):
+        if self.connection is not None and not self.in_atomic_block:
+            self.optimize()
+        super()._close()
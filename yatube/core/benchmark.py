@@ -0,0 +1,263 @@
+import json
+import math
+import random
+import threading
+import time
+from http.client import HTTPConnection
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.db import connection
+from django.test import Client
+from django.test.testcases import QuietWSGIRequestHandler
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.seeding import Seeder
+
+BENCHMARK_USER = 'benchmark'
+DATASET = {
+    'users': 50,
+    'groups': 5,
+    'posts': 500,
+    'comments': 2000,
+    'follows': 10,
+    'seed': 1,
+}
+
+
+def seed(users, groups, posts, comments, follows, seed):
+    """Детерминированный набор данных для замеров (без картинок).
+
+    Возвращает контекст сценариев: имена авторов, slug групп, id постов.
+    """
+    seeder = Seeder(seed, batch_size=1000)
+    seeder.users(users)
+    user = User.objects.create_user(username=BENCHMARK_USER)
+    seeder.groups(groups)
+    seeder.posts(posts, image_fraction=0)
+    seeder.follows(follows)
+    seeder.comments(comments)
+    return {
+        'user': user,
+        'usernames': list(
+            User.objects.filter(posts__isnull=False).distinct()
+            .values_list('username', flat=True)
+        ),
+        'slugs': list(Group.objects.values_list('slug', flat=True)),
+        'post_ids': list(Post.objects.values_list('pk', flat=True)),
+        'group_ids': list(Group.objects.values_list('pk', flat=True)),
+    }
+
+
+# Сценарий: (context, rng) -> (method, path, data)
+SCENARIOS = {
+    'index': lambda ctx, rng: ('GET', reverse('posts:index'), None),
+    'group_posts': lambda ctx, rng: (
+        'GET',
+        reverse('posts:group_list', args=[rng.choice(ctx['slugs'])]),
+        None,
+    ),
+    'profile': lambda ctx, rng: (
+        'GET',
+        reverse('posts:profile', args=[rng.choice(ctx['usernames'])]),
+        None,
+    ),
+    'post_detail': lambda ctx, rng: (
+        'GET',
+        reverse('posts:post_detail', args=[rng.choice(ctx['post_ids'])]),
+        None,
+    ),
+    'follow_index': lambda ctx, rng: (
+        'GET', reverse('posts:follow_index'), None
+    ),
+    'add_comment': lambda ctx, rng: (
+        'POST',
+        reverse('posts:add_comment', args=[rng.choice(ctx['post_ids'])]),
+        {'text': 'Комментарий из бенчмарка'},
+    ),
+    'post_create': lambda ctx, rng: (
+        'POST',
+        reverse('posts:post_create'),
+        {'text': 'Пост из бенчмарка', 'group': rng.choice(ctx['group_ids'])},
+    ),
+}
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered)) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def summarize(latencies, elapsed, queries=None, errors=0):
+    result = {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+    for percent in (50, 95, 99):
+        result[f'p{percent}_ms'] = round(
+            percentile(latencies, percent) * 1000, 2
+        )
+    if queries is not None:
+        result['queries'] = max(queries)
+        result['queries_mean'] = round(sum(queries) / len(queries), 1)
+    return result
+
+
+def is_error(status):
+    return status >= 400
+
+
+def run_client(name, context, requests, seed=1):
+    """Сценарий через тестовый клиент: задержки и SQL на запрос."""
+    scenario = SCENARIOS[name]
+    rng = random.Random(seed)
+    client = Client()
+    client.force_login(context['user'])
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        method, path, data = scenario(context, rng)
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.generic(
+                method, path, urlencode(data or {}),
+                'application/x-www-form-urlencoded'
+            )
+            latencies.append(time.perf_counter() - start)
+        queries.append(len(captured))
+        errors += is_error(response.status_code)
+    return summarize(latencies, time.perf_counter() - started,
+                     queries, errors)
+
+
+class LoadServer:
+    """Многопоточный WSGI-сервер приложения на свободном порту."""
+
+    def __enter__(self):
+        self.server = ThreadedWSGIServer(
+            ('127.0.0.1', 0), QuietWSGIRequestHandler,
+            allow_reuse_address=False
+        )
+        self.server.set_app(WSGIHandler())
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        return self.server.server_address
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def http_request(address, method, path, data, cookies):
+    body = urlencode(data) if data else None
+    headers = {
+        'Cookie': '; '.join(f'{key}={value}'
+                            for key, value in cookies.items()),
+    }
+    if 'csrftoken' in cookies:
+        headers['X-CSRFToken'] = cookies['csrftoken']
+    if body is not None:
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    http = HTTPConnection(*address, timeout=30)
+    try:
+        http.request(method, path, body, headers)
+        response = http.getresponse()
+        response.read()
+    finally:
+        http.close()
+    for header in response.msg.get_all('Set-Cookie') or ():
+        for key, morsel in SimpleCookie(header).items():
+            cookies[key] = morsel.value
+    return response.status
+
+
+def run_load(name, context, requests, threads, seed=1):
+    """Сценарий под нагрузкой threads параллельных клиентов по HTTP.
+
+    Остаток от деления requests на threads достаётся первым потокам.
+    """
+    scenario = SCENARIOS[name]
+    client = Client()
+    client.force_login(context['user'])
+    session = client.cookies['sessionid'].value
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    with LoadServer() as address:
+        def worker(number):
+            rng = random.Random(seed * 1000 + number)
+            cookies = {'sessionid': session}
+            http_request(address, 'GET', reverse('posts:post_create'),
+                         None, cookies)
+            for _ in range(requests // threads
+                           + (number < requests % threads)):
+                method, path, data = scenario(context, rng)
+                start = time.perf_counter()
+                status = http_request(address, method, path, data, cookies)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+                    errors.append(is_error(status))
+
+        workers = [threading.Thread(target=worker, args=(number,))
+                   for number in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors=sum(errors))
+
+
+def compare(results, baseline, tolerance, timing=True):
+    """Регрессии относительно baseline.
+
+    Число SQL-запросов сравнивается точно, задержка p95 и пропускная
+    способность — с допуском tolerance (доля); timing=False оставляет
+    только то, что не зависит от машины.
+    """
+    regressions = []
+    for name, modes in results.items():
+        for mode, current in modes.items():
+            label = f'{name}/{mode}'
+            if current['errors']:
+                regressions.append(f"{label}: {current['errors']} ошибок")
+            base = baseline.get(name, {}).get(mode)
+            if base is None:
+                continue
+            if current.get('queries', 0) > base.get('queries', math.inf):
+                regressions.append(
+                    f"{label}: запросов {current['queries']} "
+                    f"> {base['queries']}"
+                )
+            if not timing:
+                continue
+            if current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{label}: p95 {current['p95_ms']} мс "
+                    f"> {base['p95_ms']} мс"
+                )
+            if current['rps'] < base['rps'] * (1 - tolerance):
+                regressions.append(
+                    f"{label}: {current['rps']} rps < {base['rps']} rps"
+                )
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write('\n')
@@ -0,0 +1,27 @@
+from django.core.cache.backends.locmem import LocMemCache
+
+from .instrumentation import record_cache
+
+MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """Считает попадания и промахи кеша для текущего запроса."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, MISSING, version)
+        if value is MISSING:
+            record_cache(0, 1)
+            return default
+        record_cache(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        record_cache(len(found), len(keys) - len(found))
+        return found
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
@@ -0,0 +1,122 @@
+import random
+import sqlite3
+import threading
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+_local = threading.local()
+
+
+def use_replica(view):
+    """Разрешает view читать с реплики (если запрос не привязан к primary)."""
+    view.use_replica = True
+    return view
+
+
+def current_replica():
+    return getattr(_local, 'replica', None)
+
+
+class ReplicaRouter:
+    """Чтения view с use_replica — на реплику, всё прочее — на primary.
+
+    Реплика выбирается одна на запрос в ReplicaRoutingMiddleware, так что
+    внутри запроса все чтения видят один и тот же снимок.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_replica()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_ROUTING['REPLICAS']:
+            return False
+        return None
+
+
+class AppDatabaseRouter:
+    """Служебные приложения — в свои базы по DATABASE_APPS.
+
+    Сессии и kvstore sorl пишутся на каждом входе и первом показе
+    картинки; в отдельных файлах SQLite они не ждут блокировку записи
+    основной базы и не задерживают запись постов и комментариев.
+    """
+
+    def route(self, model):
+        return settings.DATABASE_APPS.get(model._meta.app_label)
+
+    def db_for_read(self, model, **hints):
+        return self.route(model)
+
+    def db_for_write(self, model, **hints):
+        return self.route(model)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if self.route(obj1) or self.route(obj2):
+            return self.route(obj1) == self.route(obj2)
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        apps = settings.DATABASE_APPS
+        if app_label in apps:
+            return db == apps[app_label]
+        if db in apps.values():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Включает реплику для безопасных запросов к view с use_replica.
+
+    После записи (любой небезопасный метод без ошибки) ставит cookie,
+    и PIN_SECONDS все чтения этого браузера идут на primary: автор
+    сразу видит свой пост или комментарий, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        config = settings.REPLICA_ROUTING
+        if not config['ENABLED'] or not config['REPLICAS']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            _local.replica = None
+        config = settings.REPLICA_ROUTING
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                config['PIN_COOKIE'], '1', max_age=config['PIN_SECONDS'],
+                httponly=True, samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        config = settings.REPLICA_ROUTING
+        if (getattr(view_func, 'use_replica', False)
+                and request.method in SAFE_METHODS
+                and config['PIN_COOKIE'] not in request.COOKIES):
+            _local.replica = random.choice(config['REPLICAS'])
+
+
+def replicate(source, target):
+    """Копирует файл SQLite через backup API — замена репликации.
+
+    Копия пишется в тот же файл реплики, поэтому уже открытые к ней
+    соединения видят новые данные.
+    """
+    source_connection = sqlite3.connect(source)
+    target_connection = sqlite3.connect(target)
+    try:
+        source_connection.backup(target_connection)
+    finally:
+        target_connection.close()
+        source_connection.close()
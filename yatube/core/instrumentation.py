@@ -0,0 +1,102 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.template.base import Template
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса: SQL, кеш и шаблоны."""
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - start
+
+
+def current_metrics():
+    return getattr(_local, 'metrics', None)
+
+
+def current_request():
+    return getattr(_local, 'request', None)
+
+
+@contextmanager
+def bind_request(request):
+    _local.request = request
+    try:
+        yield
+    finally:
+        _local.request = None
+
+
+@contextmanager
+def collect_metrics():
+    """Собирает метрики всего, что выполняется внутри блока.
+
+    Вложенный вызов получает уже активный сборщик, поэтому несколько
+    middleware могут делить одни счётчики.
+    """
+    if current_metrics() is not None:
+        yield current_metrics()
+        return
+    metrics = RequestMetrics()
+    _local.metrics = metrics
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(metrics.sql_wrapper)
+                )
+            yield metrics
+    finally:
+        _local.metrics = None
+
+
+def record_cache(hits, misses):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def install_template_timer():
+    """Оборачивает Template.render; учитывается только внешний шаблон.
+
+    Вложенные {% include %} входят во время внешнего, поэтому их
+    время отдельно не прибавляется.
+    """
+    if getattr(Template.render, 'timed', False):
+        return
+    render = Template.render
+
+    def timed_render(self, context):
+        metrics = current_metrics()
+        if metrics is None:
+            return render(self, context)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - start
+
+    timed_render.timed = True
+    Template.render = timed_render
@@ -0,0 +1,72 @@
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+
+
+class JournalQueue:
+    """Надёжная локальная очередь в файле JSON Lines.
+
+    put() дописывает запись и делает fsync, поэтому принятое не теряется
+    при падении процесса. Потребитель забирает накопленное take(): файл
+    атомарно переименовывается в .inflight, а после обработки ack()
+    его удаляет. Если потребитель упал до ack(), следующий take() вернёт
+    ту же пачку ещё раз. Доступ к файлам сериализуется flock на .lock.
+    """
+
+    def __init__(self, directory, name):
+        os.makedirs(directory, exist_ok=True)
+        self.pending = os.path.join(directory, f'{name}.jsonl')
+        self.inflight = os.path.join(directory, f'{name}.inflight.jsonl')
+        self.lockfile = os.path.join(directory, f'{name}.lock')
+
+    @contextmanager
+    def locked(self, operation=fcntl.LOCK_EX):
+        with open(self.lockfile, 'a') as lock:
+            fcntl.flock(lock, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read(path):
+        if not os.path.exists(path):
+            return []
+        items = []
+        with open(path, encoding='utf-8') as journal:
+            for line in journal:
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    # Недописанная строка после аварийного завершения.
+                    continue
+        return items
+
+    def put(self, item):
+        line = json.dumps(item, ensure_ascii=False) + '\n'
+        with self.locked():
+            with open(self.pending, 'a', encoding='utf-8') as journal:
+                journal.write(line)
+                journal.flush()
+                os.fsync(journal.fileno())
+
+    def items(self):
+        """Все ещё не подтверждённые записи, в порядке поступления."""
+        with self.locked(fcntl.LOCK_SH):
+            return self._read(self.inflight) + self._read(self.pending)
+
+    def take(self):
+        """Возвращает (записи, resumed); resumed — повтор после сбоя."""
+        with self.locked():
+            resumed = os.path.exists(self.inflight)
+            if not resumed:
+                if not os.path.exists(self.pending):
+                    return [], False
+                os.replace(self.pending, self.inflight)
+            return self._read(self.inflight), resumed
+
+    def ack(self):
+        with self.locked():
+            if os.path.exists(self.inflight):
+                os.remove(self.inflight)
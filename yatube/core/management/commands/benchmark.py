@@ -0,0 +1,106 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import (setup_databases, setup_test_environment,
+                               teardown_databases, teardown_test_environment)
+
+from core import benchmark
+
+MODES = ('client', 'load')
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный замер основных страниц на отдельной тестовой базе '
+            'с сравнением против baseline')
+
+    def add_arguments(self, parser):
+        for name, default in benchmark.DATASET.items():
+            parser.add_argument(f'--{name}', type=int, default=default)
+        parser.add_argument('--scenario', action='append',
+                            choices=sorted(benchmark.SCENARIOS),
+                            help='По умолчанию — все сценарии')
+        parser.add_argument('--mode', action='append', choices=MODES,
+                            help='client — тестовый клиент, load — '
+                                 'HTTP-клиенты в потоках; по умолчанию оба')
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--baseline',
+                            default=settings.BENCHMARK['BASELINE'])
+        parser.add_argument('--tolerance', type=float,
+                            default=settings.BENCHMARK['TOLERANCE'])
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Записать результаты как новый baseline')
+        parser.add_argument('--queries-only', action='store_true',
+                            help='Сравнить только число SQL-запросов: '
+                                 'задержки baseline сняты на другой машине')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['threads'] < 1:
+            raise CommandError('--requests и --threads должны быть больше 0')
+        dataset = {name: options[name] for name in benchmark.DATASET}
+        scenarios = options['scenario'] or list(benchmark.SCENARIOS)
+        modes = options['mode'] or MODES
+        setup_test_environment()
+        with tempfile.TemporaryDirectory() as directory:
+            for alias in connections:
+                test = connections[alias].settings_dict['TEST']
+                if connections[alias].vendor == 'sqlite':
+                    # Файловая база видна всем потокам сервера.
+                    test['NAME'] = os.path.join(directory, f'{alias}.db')
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                results = self.run(dataset, scenarios, modes, options)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+        self.report(results)
+        if options['save_baseline']:
+            benchmark.save_baseline(options['baseline'], results)
+            self.stdout.write(f"Baseline записан в {options['baseline']}")
+            return
+        if not os.path.exists(options['baseline']):
+            self.stdout.write('Baseline не найден, сравнение пропущено')
+            return
+        regressions = benchmark.compare(
+            results, benchmark.load_baseline(options['baseline']),
+            options['tolerance'], timing=not options['queries_only']
+        )
+        if regressions:
+            raise CommandError('Регрессии:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('Регрессий нет'))
+
+    def run(self, dataset, scenarios, modes, options):
+        context = benchmark.seed(**dataset)
+        results = {}
+        for name in scenarios:
+            results[name] = {}
+            cache.clear()
+            if 'client' in modes:
+                results[name]['client'] = benchmark.run_client(
+                    name, context, options['requests'], dataset['seed']
+                )
+            cache.clear()
+            if 'load' in modes:
+                results[name]['load'] = benchmark.run_load(
+                    name, context, options['requests'], options['threads'],
+                    dataset['seed']
+                )
+        return results
+
+    def report(self, results):
+        self.stdout.write(
+            f"{'сценарий':<14}{'режим':<8}{'p50':>9}{'p95':>9}{'p99':>9}"
+            f"{'rps':>9}{'SQL':>6}{'ошибки':>8}"
+        )
+        for name, modes in results.items():
+            for mode, result in modes.items():
+                self.stdout.write(
+                    f"{name:<14}{mode:<8}{result['p50_ms']:>9.1f}"
+                    f"{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}"
+                    f"{result['rps']:>9.1f}"
+                    f"{result.get('queries', '-'):>6}{result['errors']:>8}"
+                )
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db_router import replicate
+
+
+class Command(BaseCommand):
+    help = ('Замена репликации для локальной проверки: копирует базу '
+            'default в файлы реплик SQLite')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--follow', action='store_true',
+                            help='Повторять копирование до остановки')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Пауза между копиями в секундах '
+                                 '(задержка реплики)')
+
+    def handle(self, *args, **options):
+        databases = settings.DATABASES
+        source = databases['default']
+        replicas = settings.REPLICA_ROUTING['REPLICAS']
+        if any(databases[alias]['ENGINE'] != source['ENGINE']
+               or 'sqlite3' not in source['ENGINE'] for alias in replicas):
+            raise CommandError('Поддерживаются только реплики SQLite')
+        while True:
+            for alias in replicas:
+                replicate(source['NAME'], databases[alias]['NAME'])
+            if not options['follow']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f"Скопировано в: {', '.join(replicas)}")
@@ -0,0 +1,37 @@
+import fcntl
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.tasks import run_pending
+
+
+class Command(BaseCommand):
+    help = ('Выполняет фоновые задачи из очереди core.tasks. '
+            'Одновременно может работать только один экземпляр.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно')
+        parser.add_argument('--interval', type=float, default=0.5,
+                            help='Пауза между проверками очереди в секундах')
+
+    def handle(self, *args, **options):
+        os.makedirs(settings.TASKS['DIR'], exist_ok=True)
+        worker_lock = open(
+            os.path.join(settings.TASKS['DIR'], 'tasks.worker.lock'), 'a'
+        )
+        try:
+            fcntl.flock(worker_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise CommandError('run_tasks уже запущен')
+        with worker_lock:
+            while True:
+                done = run_pending()
+                if done:
+                    self.stdout.write(f'Выполнено задач: {done}')
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
@@ -0,0 +1,43 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.slow_queries import aggregate, load
+
+SORT_KEYS = ('total_ms', 'max_ms', 'mean_ms', 'count')
+
+
+class Command(BaseCommand):
+    help = 'Отчёт по журналу медленных SQL-запросов, по отпечаткам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--sort', choices=SORT_KEYS, default='total_ms')
+        parser.add_argument('--clear', action='store_true',
+                            help='Очистить журнал после отчёта')
+
+    def handle(self, *args, **options):
+        path = settings.SLOW_QUERY_LOG['PATH']
+        report = sorted(aggregate(load(path)),
+                        key=lambda item: item[options['sort']],
+                        reverse=True)
+        if not report:
+            self.stdout.write('Медленных запросов нет')
+        for item in report[:options['limit']]:
+            self.stdout.write(
+                f"{item['fingerprint']}  count={item['count']}  "
+                f"total={item['total_ms']:.1f}ms  "
+                f"mean={item['mean_ms']:.1f}ms  max={item['max_ms']:.1f}ms"
+            )
+            self.stdout.write(f"  {item['normalized']}")
+            for label, key in (('views', 'views'), ('from', 'frames')):
+                if item[key]:
+                    self.stdout.write(
+                        f"  {label}: {', '.join(sorted(item[key]))}"
+                    )
+            for line in item['plan'] or ():
+                self.stdout.write(f'  plan: {line}')
+            self.stdout.write('')
+        if options['clear'] and os.path.exists(path):
+            os.remove(path)
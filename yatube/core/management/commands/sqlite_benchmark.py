@@ -0,0 +1,112 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.backends.sqlite3.base import apply_pragmas
+
+SCHEMA = (
+    'CREATE TABLE post (id INTEGER PRIMARY KEY, author_id INTEGER, '
+    'text TEXT, pub_date REAL)',
+    'CREATE INDEX post_pub_date ON post (pub_date)',
+    'CREATE INDEX post_author ON post (author_id, pub_date)',
+)
+READ = ('SELECT id, author_id, text, pub_date FROM post WHERE author_id = ? '
+        'ORDER BY pub_date DESC LIMIT 10')
+WRITE = 'INSERT INTO post (author_id, text, pub_date) VALUES (?, ?, ?)'
+
+
+def operate(connection, kind, rng):
+    if kind == 'read':
+        connection.execute(READ, (rng.randrange(1000),)).fetchall()
+    else:
+        connection.execute(WRITE, (rng.randrange(1000), 'x', time.time()))
+
+
+class Command(BaseCommand):
+    help = ('Пропускная способность SQLite при параллельных чтении и записи: '
+            'стандартные настройки против SQLITE_PRAGMAS')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--rows', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        configs = (
+            # Соединение на каждый запрос, журнал по умолчанию.
+            ('stock', {}, False),
+            ('tuned', settings.SQLITE_PRAGMAS, True),
+        )
+        self.stdout.write(f"{'режим':<8}{'чтений/с':>12}{'записей/с':>12}"
+                          f"{'ошибок':>9}")
+        for name, pragmas, persistent in configs:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                self.prepare(path, pragmas, options['rows'])
+                reads, writes, errors = self.run(
+                    path, pragmas, persistent, options
+                )
+            seconds = options['seconds']
+            self.stdout.write(f'{name:<8}{reads / seconds:>12.0f}'
+                              f'{writes / seconds:>12.0f}{errors:>9}')
+
+    def prepare(self, path, pragmas, rows):
+        connection = sqlite3.connect(path, isolation_level=None)
+        apply_pragmas(connection, pragmas)
+        for statement in SCHEMA:
+            connection.execute(statement)
+        rng = random.Random(1)
+        connection.execute('BEGIN')
+        connection.executemany(WRITE, (
+            (rng.randrange(1000), 'x' * rng.randrange(50, 500), i)
+            for i in range(rows)
+        ))
+        connection.execute('COMMIT')
+        connection.close()
+
+    def run(self, path, pragmas, persistent, options):
+        deadline = time.monotonic() + options['seconds']
+        counts = {'read': 0, 'write': 0, 'error': 0}
+        lock = threading.Lock()
+
+        def worker(kind, number):
+            rng = random.Random(number)
+            connection = None
+            done = errors = 0
+            while time.monotonic() < deadline:
+                if connection is None:
+                    connection = sqlite3.connect(path, isolation_level=None,
+                                                 timeout=5)
+                    apply_pragmas(connection, pragmas)
+                try:
+                    operate(connection, kind, rng)
+                    done += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+                if not persistent:
+                    connection.close()
+                    connection = None
+            if connection is not None:
+                connection.close()
+            with lock:
+                counts[kind] += done
+                counts['error'] += errors
+
+        threads = [
+            threading.Thread(target=worker, args=(kind, number))
+            for number, kind in enumerate(
+                ['read'] * options['readers'] + ['write'] * options['writers']
+            )
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts['read'], counts['write'], counts['error']
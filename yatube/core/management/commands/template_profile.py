@@ -0,0 +1,44 @@
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.template_profiler import aggregate
+
+SORT_KEYS = ('self', 'total', 'count')
+
+
+class Command(BaseCommand):
+    help = 'Отчёт профилировщика шаблонов по шаблонам, узлам и фильтрам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument('--sort', choices=SORT_KEYS, default='self')
+        parser.add_argument('--template',
+                            help='Только узлы шаблонов с этой подстрокой')
+        parser.add_argument('--clear', action='store_true',
+                            help='Удалить накопленные данные после отчёта')
+
+    def handle(self, *args, **options):
+        directory = settings.TEMPLATE_PROFILER['DIR']
+        rows = aggregate(directory)
+        if options['template']:
+            rows = [row for row in rows
+                    if options['template'] in row['template']]
+        rows.sort(key=lambda row: row[options['sort']], reverse=True)
+        if not rows:
+            self.stdout.write('Данных профилировщика шаблонов нет')
+        else:
+            self.stdout.write(
+                f"{'self ms':>10} {'total ms':>10} {'count':>8} "
+                f"{'mean ms':>8}  шаблон / узел"
+            )
+        for row in rows[:options['limit']]:
+            self.stdout.write(
+                f"{row['self'] * 1000:10.1f} {row['total'] * 1000:10.1f} "
+                f"{row['count']:8d} "
+                f"{row['total'] * 1000 / row['count']:8.3f}  "
+                f"{row['template']}  {row['node']} {row['label']}"
+            )
+        if options['clear']:
+            shutil.rmtree(directory, ignore_errors=True)
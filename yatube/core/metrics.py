@@ -0,0 +1,191 @@
+import glob
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'yatube_requests_total': (
+        COUNTER, 'Обработанные запросы по view, методу и статусу'),
+    'yatube_request_duration_seconds': (
+        HISTOGRAM, 'Время обработки запроса'),
+    'yatube_db_queries_per_request': (
+        HISTOGRAM, 'Число SQL-запросов на HTTP-запрос'),
+    'yatube_cache_requests_total': (
+        COUNTER, 'Обращения к кешу: hit или miss'),
+    'yatube_requests_in_flight': (
+        GAUGE, 'Запросы, которые обрабатываются сейчас'),
+}
+
+HEADER = struct.Struct('i')
+VALUE = struct.Struct('d')
+INITIAL_SIZE = 64 * 1024
+
+
+class MmapValues:
+    """Словарь «ключ -> float» в mmap-файле одного процесса.
+
+    Формат: 4 байта — занятая длина, затем записи
+    [длина ключа][ключ, дополненный до 8 байт][double]. Значение
+    обновляется на месте, новая запись дописывается в конец, файл
+    при нехватке места растёт вдвое. Другие процессы только читают.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.positions = {}
+        self.file = open(path, 'a+b')
+        if os.fstat(self.file.fileno()).st_size == 0:
+            self.file.truncate(INITIAL_SIZE)
+        self.capacity = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), self.capacity)
+        self.used = HEADER.unpack_from(self.map, 0)[0] or 8
+        for key, value, position in read_entries(self.map, self.used):
+            self.positions[key] = position
+
+    def _append(self, key):
+        encoded = key.encode()
+        padded = len(encoded) + (-(len(encoded) + 4) % 8)
+        size = 4 + padded + VALUE.size
+        while self.used + size > self.capacity:
+            self.capacity *= 2
+            self.file.truncate(self.capacity)
+            self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), self.capacity)
+        struct.pack_into(
+            f'i{padded}s', self.map, self.used, len(encoded), encoded
+        )
+        position = self.used + 4 + padded
+        VALUE.pack_into(self.map, position, 0.0)
+        self.used += size
+        HEADER.pack_into(self.map, 0, self.used)
+        self.positions[key] = position
+        return position
+
+    def add(self, key, amount):
+        with self.lock:
+            position = self.positions.get(key) or self._append(key)
+            value = VALUE.unpack_from(self.map, position)[0]
+            VALUE.pack_into(self.map, position, value + amount)
+
+
+def read_entries(buffer, used):
+    position = 8
+    while position < used:
+        length = struct.unpack_from('i', buffer, position)[0]
+        padded = length + (-(length + 4) % 8)
+        key = bytes(buffer[position + 4:position + 4 + length]).decode()
+        value_position = position + 4 + padded
+        yield key, VALUE.unpack_from(buffer, value_position)[0], \
+            value_position
+        position = value_position + VALUE.size
+
+
+def read_file(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        return []
+    used = HEADER.unpack_from(data, 0)[0]
+    return [(key, value) for key, value, _ in read_entries(data, used)]
+
+
+_values = None
+_values_pid = None
+_values_lock = threading.Lock()
+
+
+def process_values():
+    """mmap-файл текущего процесса; после fork создаётся заново."""
+    global _values, _values_pid
+    pid = os.getpid()
+    if _values_pid != pid:
+        with _values_lock:
+            if _values_pid != pid:
+                directory = settings.METRICS['DIR']
+                os.makedirs(directory, exist_ok=True)
+                _values = MmapValues(os.path.join(directory, f'{pid}.db'))
+                _values_pid = pid
+    return _values
+
+
+def sample_name(name, labels, suffix=''):
+    if not labels:
+        return name + suffix
+    rendered = ','.join(
+        '{}="{}"'.format(key, str(value).replace('"', '\\"'))
+        for key, value in sorted(labels.items())
+    )
+    return f'{name}{suffix}{{{rendered}}}'
+
+
+def inc(name, labels=None, amount=1):
+    process_values().add(sample_name(name, labels), amount)
+
+
+def observe(name, value, buckets, labels=None):
+    labels = labels or {}
+    values = process_values()
+    for bound in buckets:
+        if value <= bound:
+            values.add(
+                sample_name(name, {**labels, 'le': bound}, '_bucket'), 1
+            )
+    values.add(sample_name(name, {**labels, 'le': '+Inf'}, '_bucket'), 1)
+    values.add(sample_name(name, labels, '_sum'), value)
+    values.add(sample_name(name, labels, '_count'), 1)
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def metric_name(sample):
+    name = sample.split('{', 1)[0]
+    for suffix in ('_bucket', '_sum', '_count'):
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+
+def collect():
+    """Суммирует значения всех процессов в текстовый формат Prometheus.
+
+    Счётчики и гистограммы завершившихся процессов остаются в сумме,
+    gauge учитываются только у живых.
+    """
+    totals = defaultdict(float)
+    for path in glob.glob(os.path.join(settings.METRICS['DIR'], '*.db')):
+        pid = int(os.path.basename(path).split('.')[0])
+        alive = pid_alive(pid)
+        for sample, value in read_file(path):
+            name = metric_name(sample)
+            if METRICS.get(name, (GAUGE,))[0] == GAUGE and not alive:
+                continue
+            totals[sample] += value
+    by_metric = defaultdict(list)
+    for sample, value in totals.items():
+        by_metric[metric_name(sample)].append((sample, value))
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for sample, value in sorted(by_metric.get(name, ())):
+            lines.append(f'{sample} {value!r}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,164 @@
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+from . import metrics as prometheus
+from . import profiling
+from .instrumentation import (bind_request, collect_metrics,
+                              install_template_timer)
+
+logger = logging.getLogger('yatube.performance')
+
+
+class ServerTimingMiddleware:
+    """Время запроса по слоям в заголовке Server-Timing и в логе.
+
+    Выключенная (PERFORMANCE_INSTRUMENTATION['ENABLED'] = False)
+    убирает себя из цепочки через MiddlewareNotUsed и ничего не стоит.
+    Включённая замеряет долю запросов, заданную SAMPLE_RATE.
+    """
+
+    def __init__(self, get_response):
+        config = settings.PERFORMANCE_INSTRUMENTATION
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        install_template_timer()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        start = time.perf_counter()
+        request._view_started = None
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+        end = time.perf_counter()
+        view_time = end - (request._view_started or start)
+        timings = {
+            'db': metrics.query_time,
+            'tpl': metrics.template_time,
+            'view': view_time,
+            'total': end - start,
+        }
+        response['Server-Timing'] = ', '.join(
+            [
+                f'db;dur={timings["db"] * 1000:.2f};'
+                f'desc="{metrics.queries} queries"',
+                f'cache;desc="{metrics.cache_hits} hits, '
+                f'{metrics.cache_misses} misses"',
+            ] + [
+                f'{name};dur={timings[name] * 1000:.2f}'
+                for name in ('tpl', 'view', 'total')
+            ]
+        )
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'cache_hits': metrics.cache_hits,
+            'cache_misses': metrics.cache_misses,
+            **{f'{name}_ms': round(value * 1000, 2)
+               for name, value in timings.items()},
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+
+class SlowQueryContextMiddleware:
+    """Запоминает текущий запрос, чтобы журнал медленных SQL знал view."""
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with bind_request(request):
+            return self.get_response(request)
+
+
+class MetricsMiddleware:
+    """Счётчики и гистограммы для /metrics по имени URL."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        prometheus.inc('yatube_requests_in_flight')
+        start = time.perf_counter()
+        try:
+            with collect_metrics() as metrics:
+                response = self.get_response(request)
+        finally:
+            prometheus.inc('yatube_requests_in_flight', amount=-1)
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        prometheus.inc('yatube_requests_total', {
+            'view': view,
+            'method': request.method,
+            'status': response.status_code,
+        })
+        prometheus.observe(
+            'yatube_request_duration_seconds', time.perf_counter() - start,
+            prometheus.LATENCY_BUCKETS, {'view': view}
+        )
+        prometheus.observe(
+            'yatube_db_queries_per_request', metrics.queries,
+            prometheus.QUERY_BUCKETS, {'view': view}
+        )
+        for result, count in (('hit', metrics.cache_hits),
+                              ('miss', metrics.cache_misses)):
+            if count:
+                prometheus.inc('yatube_cache_requests_total',
+                               {'result': result}, count)
+        return response
+
+
+class ProfilingMiddleware:
+    """Профилирование отдельного запроса по ?_profile или X-Profile.
+
+    Срабатывает только для is_staff; остальным параметр ничего не даёт.
+    Отчёты (топ функций и collapsed stacks) сохраняются в
+    PROFILING['DIR'], имя возвращается в заголовке X-Profile. Значение
+    ``top`` или ``collapsed`` вместо страницы отдаёт сам отчёт.
+    Ставится после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        config = settings.PROFILING
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.param = config['PARAM']
+        self.header = 'HTTP_' + config['HEADER'].upper().replace('-', '_')
+
+    def __call__(self, request):
+        mode = request.GET.get(self.param, request.META.get(self.header))
+        if mode is None or not request.user.is_staff:
+            return self.get_response(request)
+        response, top, collapsed = profiling.profile_call(
+            self.get_response, request
+        )
+        match = request.resolver_match
+        view = match.view_name.replace(':', '.') if match else 'unresolved'
+        name = profiling.store(view, top, collapsed)
+        if mode in ('top', 'collapsed'):
+            response = HttpResponse(
+                top if mode == 'top' else collapsed,
+                content_type='text/plain; charset=utf-8'
+            )
+        response['X-Profile'] = name
+        return response
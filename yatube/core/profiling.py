@@ -0,0 +1,91 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+
+class StackSampler(threading.Thread):
+    """Снимает стек одного потока каждые interval секунд.
+
+    Результат — collapsed stacks (``a;b;c 12``), которые понимают
+    flamegraph.pl и speedscope.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.finished = threading.Event()
+
+    def run(self):
+        while not self.finished.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[';'.join(frame_stack(frame))] += 1
+
+    def stop(self):
+        self.finished.set()
+        self.join()
+
+    def collapsed(self):
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in self.stacks.most_common()
+        )
+
+
+def frame_label(frame):
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(settings.BASE_DIR):
+        filename = os.path.relpath(filename, settings.BASE_DIR)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+def frame_stack(frame):
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame))
+        frame = frame.f_back
+    return reversed(stack)
+
+
+def profile_call(func, *args):
+    """Вызывает func под cProfile и сэмплером.
+
+    Возвращает результат, таблицу топ-N функций по суммарному времени
+    и collapsed stacks.
+    """
+    config = settings.PROFILING
+    sampler = StackSampler(threading.get_ident(), config['INTERVAL'])
+    profile = cProfile.Profile()
+    sampler.start()
+    try:
+        result = profile.runcall(func, *args)
+    finally:
+        sampler.stop()
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats('cumulative').print_stats(config['TOP'])
+    return result, stream.getvalue(), sampler.collapsed()
+
+
+def store(name, top, collapsed):
+    directory = settings.PROFILING['DIR']
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(
+        directory, '{}-{}-{}'.format(
+            time.strftime('%Y%m%d-%H%M%S'), os.getpid(), name
+        )
+    )
+    with open(base + '.txt', 'w', encoding='utf-8') as file:
+        file.write(top)
+    with open(base + '.collapsed', 'w', encoding='utf-8') as file:
+        file.write(collapsed)
+    return os.path.basename(base)
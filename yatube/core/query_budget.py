@@ -0,0 +1,68 @@
+import logging
+from contextlib import ExitStack
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('yatube.query_budget')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+TRANSACTION_CONTROL = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+# Планы запросов добавляет журнал медленных запросов, а не view.
+NOT_COUNTED = TRANSACTION_CONTROL + ('EXPLAIN',)
+
+
+class QueryCounter:
+    def __init__(self, ignore=()):
+        self.ignore = ignore
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not (sql.lstrip().upper().startswith(NOT_COUNTED)
+                or any(pattern in sql for pattern in self.ignore)):
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+def query_budget(limit):
+    """Не больше limit SQL-запросов на вызов view.
+
+    Считаются запросы самой view и отрисовки шаблона, включая ленивую
+    загрузку сессии и пользователя. Не считаются BEGIN, SAVEPOINT и
+    подобные, EXPLAIN журнала медленных запросов, а также запросы с
+    подстроками из QUERY_BUDGET['IGNORE'].
+    При превышении пишет в лог yatube.query_budget, а с
+    QUERY_BUDGET['RAISE'] (DEBUG и тесты) бросает QueryBudgetExceeded.
+    Ставится ближе всех к функции view, под cache_page и login_required.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            config = settings.QUERY_BUDGET
+            if not config['ENABLED']:
+                return view(request, *args, **kwargs)
+            counter = QueryCounter(config['IGNORE'])
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                response = view(request, *args, **kwargs)
+            if len(counter.queries) > limit:
+                message = (
+                    f'{view.__module__}.{view.__name__}: '
+                    f'{len(counter.queries)} SQL-запросов при бюджете {limit}'
+                )
+                if config['RAISE']:
+                    raise QueryBudgetExceeded(
+                        '\n'.join([message] + counter.queries)
+                    )
+                logger.warning(message, extra={'queries': counter.queries})
+            return response
+
+        wrapper.query_budget = limit
+        return wrapper
+    return decorator
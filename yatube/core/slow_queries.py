@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.utils import timezone
+
+from .instrumentation import current_request
+
+logger = logging.getLogger('yatube.slow_queries')
+_local = threading.local()
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%s|\?')
+IN_LIST = re.compile(r'IN \((?:\?,\s*)*\?\)')
+SPACES = re.compile(r'\s+')
+
+
+def normalize(sql):
+    """SQL без конкретных значений: одинаковые запросы совпадают."""
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER.sub('?', sql)
+    sql = PLACEHOLDER.sub('?', sql)
+    sql = IN_LIST.sub('IN (...)', sql)
+    return SPACES.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.md5(normalized_sql.encode()).hexdigest()[:12]
+
+
+def calling_frame():
+    """Ближайший к запросу кадр стека из кода проекта."""
+    root = settings.BASE_DIR
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        filename = os.path.abspath(frame.filename)
+        if (filename.startswith(root)
+                and 'site-packages' not in filename
+                and not filename.startswith(os.path.dirname(__file__))):
+            relative = os.path.relpath(filename, root)
+            return f'{relative}:{frame.lineno} in {frame.name}'
+    return None
+
+
+def explain(connection, sql, params):
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    )
+    _local.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [' '.join(str(col) for col in row)
+                    for row in cursor.fetchall()]
+    except Exception as error:
+        return [f'EXPLAIN не удался: {error}']
+    finally:
+        _local.explaining = False
+
+
+def record(entry):
+    path = settings.SLOW_QUERY_LOG['PATH']
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as log:
+        log.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    if getattr(_local, 'explaining', False):
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = (time.perf_counter() - start) * 1000
+    config = settings.SLOW_QUERY_LOG
+    if duration < config['THRESHOLD_MS']:
+        return result
+    request = current_request()
+    match = request.resolver_match if request is not None else None
+    normalized = normalize(sql)
+    entry = {
+        'time': timezone.now().isoformat(),
+        'fingerprint': fingerprint(normalized),
+        'normalized': normalized,
+        'sql': sql,
+        'params': None if many else params,
+        'duration_ms': round(duration, 2),
+        'view': match.view_name if match else None,
+        'frame': calling_frame(),
+        'plan': (
+            explain(context['connection'], sql, params)
+            if config['EXPLAIN'] and not many else None
+        ),
+    }
+    logger.warning(
+        'Медленный запрос %.1f мс в %s: %s',
+        duration, entry['view'] or entry['frame'], normalized
+    )
+    record(entry)
+    return result
+
+
+def install(connection):
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def on_connection_created(sender, connection, **kwargs):
+    if settings.SLOW_QUERY_LOG['ENABLED']:
+        install(connection)
+
+
+def load(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as log:
+        return [json.loads(line) for line in log if line.strip()]
+
+
+def aggregate(entries):
+    """Сводка по отпечаткам запросов."""
+    report = {}
+    for entry in entries:
+        item = report.setdefault(entry['fingerprint'], {
+            'fingerprint': entry['fingerprint'],
+            'normalized': entry['normalized'],
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'views': set(),
+            'frames': set(),
+            'plan': entry['plan'],
+        })
+        item['count'] += 1
+        item['total_ms'] += entry['duration_ms']
+        item['max_ms'] = max(item['max_ms'], entry['duration_ms'])
+        for key, value in (('views', entry['view']),
+                           ('frames', entry['frame'])):
+            if value:
+                item[key].add(value)
+    for item in report.values():
+        item['mean_ms'] = item['total_ms'] / item['count']
+    return list(report.values())
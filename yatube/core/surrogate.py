@@ -0,0 +1,63 @@
+import requests
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+
+from .tasks import task
+
+
+def tag(request, response, *keys):
+    """Добавляет ключи в заголовок Surrogate-Key ответа.
+
+    Прокси кеширует ответ на Surrogate-Control max-age и выбрасывает
+    все ответы с ключом, когда приходит purge этого ключа. Страницы
+    вошедшего пользователя (имя, подписки, CSRF-токен формы) ключей
+    не получают и помечаются private.
+    """
+    config = settings.SURROGATE_KEYS
+    if not config['ENABLED'] or not keys:
+        return response
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True)
+        return response
+    header = config['HEADER']
+    current = response[header].split() if response.has_header(header) else []
+    response[header] = ' '.join(dict.fromkeys(current + list(keys)))
+    response['Surrogate-Control'] = f"max-age={config['MAX_AGE']}"
+    return response
+
+
+def purge(*keys):
+    """Сбрасывает в прокси ответы с ключами; запрос уходит задачей."""
+    if settings.SURROGATE_KEYS['ENABLED'] and keys:
+        purge_keys.delay(sorted(set(keys)))
+
+
+@task
+def purge_keys(keys):
+    import_string(settings.SURROGATE_KEYS['BACKEND'])().purge(keys)
+
+
+class HTTPPurgeBackend:
+    """Один запрос PURGE_METHOD на PURGE_URL с ключами в PURGE_HEADER.
+
+    Подходит для Varnish с xkey (PURGE_HEADER = 'xkey-purge') и прокси
+    с похожим API; ошибка ответа попадает в лог yatube.tasks.
+    """
+
+    def purge(self, keys):
+        config = settings.SURROGATE_KEYS
+        response = requests.request(
+            config['PURGE_METHOD'], config['PURGE_URL'],
+            headers={config['PURGE_HEADER']: ' '.join(keys)},
+            timeout=config['TIMEOUT'],
+        )
+        response.raise_for_status()
+
+
+class LocMemPurgeBackend:
+    """Заглушка для тестов и разработки: ключи копятся в purged."""
+    purged = []
+
+    def purge(self, keys):
+        self.purged.extend(keys)
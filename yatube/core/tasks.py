@@ -0,0 +1,61 @@
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .journal import JournalQueue
+
+logger = logging.getLogger('yatube.tasks')
+
+
+def task_queue():
+    return JournalQueue(settings.TASKS['DIR'], 'tasks')
+
+
+def task(func):
+    """Фоновая задача: func.delay(*args) ставит вызов в очередь.
+
+    Очередь выполняет `manage.py run_tasks --loop`. Вызов попадает в
+    очередь после фиксации транзакции, чтобы обработчик увидел
+    записанные данные. Аргументы — только то, что переживает JSON.
+    Задачи должны быть идемпотентными: после сбоя обработчика пачка
+    выполняется ещё раз. С TASKS['EAGER'] вызов выполняется сразу
+    (тесты, разработка).
+    """
+    name = f'{func.__module__}.{func.__name__}'
+
+    def delay(*args):
+        if settings.TASKS['EAGER']:
+            func(*args)
+            return
+        transaction.on_commit(
+            lambda: task_queue().put({'task': name, 'args': list(args)})
+        )
+
+    func.delay = delay
+    return func
+
+
+def run_pending():
+    """Выполняет накопленные задачи, одинаковые вызовы — один раз.
+
+    Ошибка задачи пишется в лог yatube.tasks и не останавливает
+    остальные. Возвращает число выполненных вызовов.
+    """
+    queue = task_queue()
+    items, _ = queue.take()
+    seen = set()
+    for item in items:
+        key = json.dumps(item, sort_keys=True)
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            import_string(item['task'])(*item['args'])
+        except Exception:
+            logger.exception('Задача %s(%s) завершилась ошибкой',
+                             item['task'], item['args'])
+    queue.ack()
+    return len(seen)
@@ -0,0 +1,147 @@
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.template.base import Node, Parser, TextNode, TokenType
+from django.template.loader_tags import IncludeNode
+
+_local = threading.local()
+_lock = threading.Lock()
+_stats = defaultdict(lambda: [0, 0.0, 0.0])
+_last_dump = time.monotonic()
+
+
+def node_key(node):
+    origin = getattr(node, 'origin', None)
+    template = getattr(origin, 'template_name', None) or '<string>'
+    token = getattr(node, 'token', None)
+    if isinstance(node, IncludeNode):
+        label = '{% include ' + node.template.token + ' %}'
+    elif token is not None and token.token_type == TokenType.BLOCK:
+        label = '{% ' + token.contents.split()[0] + ' %}'
+    else:
+        label = '{{ }}'
+    return template, type(node).__name__, label
+
+
+def timed(key, func, *args, **kwargs):
+    """Вызывает func и учитывает полное и собственное время под key.
+
+    Собственное время — без вложенных узлов и фильтров, поэтому
+    include с тяжёлым шаблоном внутри не дублирует его стоимость.
+    """
+    stack = _local.__dict__.setdefault('stack', [])
+    frame = [key[0], 0.0]
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        if stack:
+            stack[-1][1] += elapsed
+        with _lock:
+            entry = _stats[key]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - frame[1]
+
+
+def current_template():
+    stack = getattr(_local, 'stack', None)
+    return stack[-1][0] if stack else '<string>'
+
+
+def profiled_filter(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return timed(
+            (current_template(), 'filter', f'|{name}'), func, *args, **kwargs
+        )
+    return wrapper
+
+
+_render_annotated = Node.render_annotated
+_find_filter = Parser.find_filter
+_wrapped_filters = {}
+
+
+def profiled_render_annotated(self, context):
+    if isinstance(self, TextNode):
+        return _render_annotated(self, context)
+    return timed(node_key(self), _render_annotated, self, context)
+
+
+def profiled_find_filter(self, filter_name):
+    func = _find_filter(self, filter_name)
+    if func not in _wrapped_filters:
+        _wrapped_filters[func] = profiled_filter(filter_name, func)
+    return _wrapped_filters[func]
+
+
+def install():
+    """Подменяет Node.render_annotated и Parser.find_filter.
+
+    Вызывается до разбора первого шаблона: фильтры оборачиваются
+    при компиляции, а скомпилированные шаблоны кешируются загрузчиком.
+    """
+    Node.render_annotated = profiled_render_annotated
+    Parser.find_filter = profiled_find_filter
+
+
+def uninstall():
+    Node.render_annotated = _render_annotated
+    Parser.find_filter = _find_filter
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    with _lock:
+        return [
+            {'template': template, 'node': node, 'label': label,
+             'count': count, 'total': total, 'self': own}
+            for (template, node, label), (count, total, own) in _stats.items()
+        ]
+
+
+def dump(**kwargs):
+    """Сохраняет статистику процесса в TEMPLATE_PROFILER['DIR'].
+
+    Подключается к request_finished; пишет не чаще DUMP_INTERVAL.
+    """
+    global _last_dump
+    config = settings.TEMPLATE_PROFILER
+    now = time.monotonic()
+    if now - _last_dump < config['DUMP_INTERVAL']:
+        return
+    _last_dump = now
+    os.makedirs(config['DIR'], exist_ok=True)
+    path = os.path.join(config['DIR'], f'{os.getpid()}.json')
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(snapshot(), file)
+    os.replace(path + '.tmp', path)
+
+
+def aggregate(directory):
+    """Сводит файлы всех процессов: строка на шаблон, тип узла и метку."""
+    totals = {}
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        with open(path, encoding='utf-8') as file:
+            for row in json.load(file):
+                key = (row['template'], row['node'], row['label'])
+                total = totals.setdefault(
+                    key, dict(row, count=0, total=0.0, self=0.0)
+                )
+                for field in ('count', 'total', 'self'):
+                    total[field] += row[field]
+    return list(totals.values())
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+@override_settings(AUTH_CACHE={'ENABLED': True, 'TIMEOUT': 300})
+class CachedAuthenticationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='auth',
+                                             password='pass')
+        Post.objects.create(author=self.user, text='Пост',
+                            group=self.group)
+        self.client = Client()
+        self.client.login(username='auth', password='pass')
+
+    def queries(self, client, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_authenticated_feed_costs_as_anonymous(self):
+        '''Сессия и пользователь после первого запроса берутся из кеша.'''
+        url = reverse('posts:group_list', args=['test-slug'])
+        self.queries(self.client, url)
+        self.assertEqual(self.queries(self.client, url),
+                         self.queries(Client(), url))
+
+    def test_password_change_ends_other_sessions(self):
+        '''Смена пароля сбрасывает закешированного пользователя.'''
+        url = reverse('posts:post_create')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.user.set_password('new')
+        self.user.save()
+        self.assertRedirects(
+            self.client.get(url), f"{reverse('users:login')}?next={url}"
+        )
+
+    def test_user_edit_is_visible(self):
+        '''Правка пользователя видна в следующем запросе.'''
+        url = reverse('posts:post_create')
+        response = self.client.get(url)
+        self.assertEqual(response.context['user'].first_name, '')
+        self.user.first_name = 'Лев'
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.context['user'].first_name, 'Лев')
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+
+from core import benchmark
+from posts.models import Comment
+
+
+class BenchmarkTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.context = benchmark.seed(**benchmark.DATASET)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_queries_do_not_regress(self):
+        '''Число SQL-запросов сценариев не больше, чем в baseline.'''
+        results = {
+            name: {'client': benchmark.run_client(name, self.context, 10)}
+            for name in benchmark.SCENARIOS
+        }
+        baseline = benchmark.load_baseline(settings.BENCHMARK['BASELINE'])
+        self.assertEqual(
+            benchmark.compare(results, baseline, 0, timing=False), []
+        )
+
+    def test_compare_reports_regressions(self):
+        base = {'p95_ms': 10.0, 'rps': 100.0, 'queries': 5, 'errors': 0}
+        current = {'p95_ms': 20.0, 'rps': 40.0, 'queries': 6, 'errors': 1}
+        regressions = benchmark.compare(
+            {'index': {'client': current}}, {'index': {'client': base}}, 0.25
+        )
+        self.assertEqual(len(regressions), 4)
+        within_tolerance = dict(base, p95_ms=12.0, rps=80.0)
+        self.assertEqual(benchmark.compare(
+            {'index': {'client': within_tolerance}},
+            {'index': {'client': base}}, 0.25
+        ), [])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmark.percentile(values, 50), 50)
+        self.assertEqual(benchmark.percentile(values, 99), 99)
+        self.assertEqual(benchmark.percentile([7], 95), 7)
+
+
+class LoadDriverTests(TransactionTestCase):
+    def test_threads_get_and_post(self):
+        context = benchmark.seed(users=5, groups=2, posts=20, comments=10,
+                                 follows=2, seed=1)
+        for name in ('index', 'add_comment'):
+            with self.subTest(name=name):
+                result = benchmark.run_load(name, context, 7, 2)
+                self.assertEqual(result['requests'], 7)
+                self.assertEqual(result['errors'], 0)
+        self.assertEqual(Comment.objects.count(), 10 + 7)
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connections
+from django.test import (Client, SimpleTestCase, TransactionTestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from sorl.thumbnail.models import KVStore
+
+from core.db_router import AppDatabaseRouter, replicate
+from posts.models import Post, User
+
+ROUTING_ON = {'ENABLED': True, 'REPLICAS': ['replica'], 'PIN_SECONDS': 5,
+              'PIN_COOKIE': 'pin_primary'}
+
+
+@override_settings(REPLICA_ROUTING=ROUTING_ON)
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='auth')
+        self.post = Post.objects.create(author=self.author, text='Пост')
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def queries(self, method, url, data=None):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(url, data)
+        return response, len(primary), len(replica)
+
+    def test_reads_go_to_replica(self):
+        for url in (reverse('posts:index'),
+                    reverse('posts:post_detail', args=[self.post.pk]),
+                    reverse('posts:profile', args=['auth'])):
+            with self.subTest(url=url):
+                response, primary, replica = self.queries('get', url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(primary, 0)
+                self.assertGreater(replica, 0)
+
+    def test_unmarked_views_use_primary(self):
+        response, primary, replica = self.queries(
+            'get', reverse('posts:post_create')
+        )
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_reads_stick_to_primary_after_write(self):
+        response, primary, replica = self.queries(
+            'post', reverse('posts:post_create'), {'text': 'Новый пост'}
+        )
+        self.assertEqual(replica, 0)
+        self.assertIn('pin_primary', response.cookies)
+        response, primary, replica = self.queries(
+            'get', reverse('posts:profile', args=['auth'])
+        )
+        self.assertContains(response, 'Новый пост')
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+
+@override_settings(DATABASE_APPS={'sessions': 'sessions',
+                                  'thumbnail': 'kvstore'})
+class AppDatabaseRouterTests(SimpleTestCase):
+    router = AppDatabaseRouter()
+
+    def test_service_apps_use_own_databases(self):
+        self.assertEqual(self.router.db_for_write(Session), 'sessions')
+        self.assertEqual(self.router.db_for_read(Session), 'sessions')
+        self.assertEqual(self.router.db_for_write(KVStore), 'kvstore')
+        self.assertIsNone(self.router.db_for_write(Post))
+
+    def test_migrations_follow_routes(self):
+        allow = self.router.allow_migrate
+        self.assertTrue(allow('sessions', 'sessions'))
+        self.assertFalse(allow('default', 'sessions'))
+        self.assertFalse(allow('sessions', 'posts'))
+        self.assertIsNone(allow('default', 'posts'))
+
+    def test_relations_only_within_database(self):
+        self.assertFalse(self.router.allow_relation(
+            Session(), Post()
+        ))
+        self.assertIsNone(self.router.allow_relation(Post(), User()))
+
+
+class ReplicateTests(SimpleTestCase):
+    def test_backup_copies_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'source.sqlite3')
+            target = os.path.join(directory, 'target.sqlite3')
+            db = sqlite3.connect(source)
+            db.execute('CREATE TABLE item (name TEXT)')
+            db.execute("INSERT INTO item VALUES ('пост')")
+            db.commit()
+            db.close()
+            reader = sqlite3.connect(target)
+            replicate(source, target)
+            self.assertEqual(
+                reader.execute('SELECT name FROM item').fetchall(),
+                [('пост',)]
+            )
+            reader.close()
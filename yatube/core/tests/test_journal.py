@@ -0,0 +1,39 @@
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from core.journal import JournalQueue
+
+
+class JournalQueueTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = JournalQueue(self.directory, 'test')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_take_and_ack(self):
+        self.queue.put({'n': 1})
+        self.queue.put({'n': 2})
+        items, resumed = self.queue.take()
+        self.assertEqual(items, [{'n': 1}, {'n': 2}])
+        self.assertFalse(resumed)
+        self.queue.put({'n': 3})
+        self.assertEqual(len(self.queue.items()), 3)
+        self.queue.ack()
+        self.assertEqual(self.queue.take(), ([{'n': 3}], False))
+
+    def test_unacked_batch_is_redelivered(self):
+        '''Пачка без ack() после сбоя выдаётся снова.'''
+        self.queue.put({'n': 1})
+        self.queue.take()
+        self.queue.put({'n': 2})
+        self.assertEqual(self.queue.take(), ([{'n': 1}], True))
+
+    def test_truncated_line_is_skipped(self):
+        self.queue.put({'n': 1})
+        with open(self.queue.pending, 'a') as journal:
+            journal.write('{"n": ')
+        self.assertEqual(self.queue.items(), [{'n': 1}])
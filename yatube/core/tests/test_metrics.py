@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+from posts.models import Post, User
+
+METRICS_DIR = tempfile.mkdtemp()
+METRICS_ON = {'ENABLED': True, 'DIR': METRICS_DIR,
+              'ALLOWED_IPS': ['127.0.0.1'], 'TOKEN': ''}
+DEAD_PID = 2 ** 22 + 1
+
+
+@override_settings(METRICS=METRICS_ON)
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
+        metrics._values_pid = None
+
+    def test_values_survive_reopen(self):
+        path = os.path.join(METRICS_DIR, 'values.db')
+        os.makedirs(METRICS_DIR)
+        values = metrics.MmapValues(path)
+        values.add('a', 1)
+        values.add('b' * 5000, 2.5)
+        values.add('a', 1)
+        self.assertEqual(
+            dict(metrics.read_file(path)), {'a': 2.0, 'b' * 5000: 2.5}
+        )
+        metrics.MmapValues(path).add('a', 1)
+        self.assertEqual(dict(metrics.read_file(path))['a'], 3.0)
+
+    def test_collect_sums_processes_and_skips_dead_gauges(self):
+        metrics.inc('yatube_cache_requests_total', {'result': 'hit'})
+        metrics.inc('yatube_requests_in_flight')
+        dead = metrics.MmapValues(os.path.join(METRICS_DIR, f'{DEAD_PID}.db'))
+        dead.add('yatube_cache_requests_total{result="hit"}', 2)
+        dead.add('yatube_requests_in_flight', 5)
+        output = metrics.collect()
+        self.assertIn('yatube_cache_requests_total{result="hit"} 3.0', output)
+        self.assertIn('yatube_requests_in_flight 1.0', output)
+
+    def test_endpoint_exposes_request_metrics(self):
+        client = Client()
+        client.get(reverse('posts:index'))
+        response = client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        output = response.content.decode()
+        self.assertIn('# TYPE yatube_request_duration_seconds histogram',
+                      output)
+        self.assertIn(
+            'yatube_requests_total{method="GET",status="200",'
+            'view="posts:index"} 1.0', output
+        )
+        self.assertIn(
+            'yatube_db_queries_per_request_count{view="posts:index"} 1.0',
+            output
+        )
+
+    def test_endpoint_restricted(self):
+        response = Client(REMOTE_ADDR='10.0.0.1').get(reverse('metrics'))
+        self.assertEqual(response.status_code, 404)
+        with self.settings(METRICS={**METRICS_ON, 'ENABLED': False}):
+            response = Client().get(reverse('metrics'))
+        self.assertEqual(response.status_code, 404)
+
+    def test_proxied_request_not_local(self):
+        '''Запрос через прокси приходит с loopback, но не пускается.'''
+        response = Client().get(reverse('metrics'),
+                                HTTP_X_FORWARDED_FOR='203.0.113.7')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS={**METRICS_ON, 'TOKEN': 'secret'})
+    def test_token_required_when_configured(self):
+        url = reverse('metrics')
+        for headers, status in (
+            ({}, 404),
+            ({'HTTP_AUTHORIZATION': 'Bearer wrong'}, 404),
+            ({'HTTP_AUTHORIZATION': 'Bearer secret',
+              'HTTP_X_FORWARDED_FOR': '203.0.113.7'}, 200),
+        ):
+            with self.subTest(headers=headers):
+                response = Client().get(url, **headers)
+                self.assertEqual(response.status_code, status)
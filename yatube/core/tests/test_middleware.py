@@ -0,0 +1,52 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+INSTRUMENTATION_ON = {'ENABLED': True, 'SAMPLE_RATE': 1.0}
+
+
+class ServerTimingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION=INSTRUMENTATION_ON)
+    def test_server_timing_header_and_log(self):
+        client = Client()
+        with self.assertLogs('yatube.performance', 'INFO') as logs:
+            response = client.get(reverse('posts:index'))
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'cache;desc=', 'tpl;dur=', 'view;dur=',
+                       'total;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, header)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'posts:index')
+        self.assertGreater(record['queries'], 0)
+        self.assertEqual(record['cache_misses'], 1)
+
+        with self.assertLogs('yatube.performance', 'INFO') as logs:
+            client.get(reverse('posts:index'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertGreater(record['cache_hits'], 0)
+        self.assertEqual(record['queries'], 0)
+
+    @override_settings(
+        PERFORMANCE_INSTRUMENTATION={**INSTRUMENTATION_ON, 'SAMPLE_RATE': 0}
+    )
+    def test_unsampled_request(self):
+        response = Client().get(reverse('posts:index'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_disabled_by_default(self):
+        response = Client().get(reverse('posts:index'))
+        self.assertNotIn('Server-Timing', response)
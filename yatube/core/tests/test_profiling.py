@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Post, User
+
+PROFILES_DIR = tempfile.mkdtemp()
+PROFILING_ON = {'ENABLED': True, 'PARAM': '_profile', 'HEADER': 'X-Profile',
+                'INTERVAL': 0.0005, 'TOP': 10, 'DIR': PROFILES_DIR}
+FOLLOW_INDEX = reverse('posts:follow_index')
+
+
+@override_settings(PROFILING=PROFILING_ON)
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.user = User.objects.create_user(username='user')
+        cls.author = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.author, text='Тестовый пост')
+        Follow.objects.create(user=cls.staff, author=cls.author)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PROFILES_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def client_for(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def test_staff_gets_top_table(self):
+        response = self.client_for(self.staff).get(
+            FOLLOW_INDEX, {'_profile': 'top'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('cumulative', response.content.decode())
+        name = response['X-Profile']
+        for suffix in ('.txt', '.collapsed'):
+            with self.subTest(suffix=suffix):
+                self.assertTrue(
+                    os.path.exists(os.path.join(PROFILES_DIR, name + suffix))
+                )
+
+    def test_header_keeps_page_and_stores_collapsed_stacks(self):
+        response = self.client_for(self.staff).get(
+            FOLLOW_INDEX, HTTP_X_PROFILE='1'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        path = os.path.join(PROFILES_DIR, response['X-Profile'] + '.collapsed')
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                stack, count = line.rsplit(' ', 1)
+                self.assertGreater(int(count), 0)
+                self.assertIn(';', stack)
+
+    def test_not_staff_is_ignored(self):
+        for client in (Client(), self.client_for(self.user)):
+            response = client.get(reverse('posts:index'), {'_profile': 'top'})
+            self.assertNotIn('X-Profile', response)
+            self.assertEqual(response['Content-Type'],
+                             'text/html; charset=utf-8')
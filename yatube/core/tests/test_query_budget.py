@@ -0,0 +1,36 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.query_budget import QueryBudgetExceeded, query_budget
+from posts.models import Post, User
+
+ENFORCED = {'ENABLED': True, 'RAISE': True, 'IGNORE': []}
+
+
+@query_budget(1)
+def two_queries(request):
+    User.objects.exists()
+    Post.objects.exists()
+    return HttpResponse()
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    @override_settings(QUERY_BUDGET=ENFORCED)
+    def test_raises_when_enforced(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded,
+                                      '2 SQL-запросов при бюджете 1'):
+            two_queries(self.request)
+
+    @override_settings(QUERY_BUDGET={**ENFORCED, 'RAISE': False})
+    def test_logs_in_production(self):
+        with self.assertLogs('yatube.query_budget', 'WARNING') as logs:
+            response = two_queries(self.request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(logs.records[0].queries), 2)
+
+    @override_settings(QUERY_BUDGET={**ENFORCED, 'ENABLED': False})
+    def test_disabled(self):
+        self.assertEqual(two_queries(self.request).status_code, 200)
@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import slow_queries
+from posts.models import Post, User
+
+
+class NormalizeTests(TestCase):
+    def test_same_fingerprint_for_different_values(self):
+        first = slow_queries.normalize(
+            "SELECT * FROM t WHERE a = 1 AND b = 'x' AND c IN (%s, %s)"
+        )
+        second = slow_queries.normalize(
+            "SELECT * FROM t WHERE a = 25 AND b = 'it''s'  AND c IN (%s)"
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(
+            first, 'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...)'
+        )
+
+
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(SLOW_QUERY_LOG={
+            'ENABLED': True,
+            'THRESHOLD_MS': 0,
+            'EXPLAIN': True,
+            'PATH': f'{self.log_dir}/slow.jsonl',
+        })
+        self.settings_override.enable()
+        slow_queries.install(connection)
+
+    def tearDown(self):
+        connection.execute_wrappers.remove(slow_queries.slow_query_wrapper)
+        self.settings_override.disable()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def test_slow_queries_logged_with_view_and_plan(self):
+        with self.assertLogs('yatube.slow_queries', 'WARNING'):
+            Client().get(
+                reverse('posts:profile', kwargs={'username': 'auth'})
+            )
+        entries = slow_queries.load(f'{self.log_dir}/slow.jsonl')
+        post_queries = [
+            entry for entry in entries if 'posts_post' in entry['sql']
+        ]
+        self.assertTrue(post_queries)
+        entry = post_queries[0]
+        self.assertEqual(entry['view'], 'posts:profile')
+        self.assertTrue(entry['frame'])
+        self.assertTrue(entry['plan'])
+
+    def test_report_command(self):
+        with self.assertLogs('yatube.slow_queries', 'WARNING'):
+            for _ in range(2):
+                list(Post.objects.filter(pk=1))
+        out = StringIO()
+        call_command('slow_queries', stdout=out)
+        self.assertIn('count=2', out.getvalue())
+        self.assertIn('plan:', out.getvalue())
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from core.backends.sqlite3.base import DatabaseWrapper
+
+
+def pragma(db, name):
+    with db.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+class SQLitePragmaTests(TestCase):
+    def test_pragmas_applied(self):
+        self.assertEqual(pragma(connection, 'synchronous'), 1)
+        self.assertEqual(pragma(connection, 'temp_store'), 2)
+        self.assertEqual(pragma(connection, 'busy_timeout'), 5000)
+        self.assertEqual(pragma(connection, 'cache_size'), -64000)
+
+
+class SQLiteFileDatabaseTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': os.path.join(directory.name, 'db.sqlite3'),
+        })
+        self.addCleanup(self.db.close)
+
+    def test_wal_and_optimize_on_close(self):
+        self.assertEqual(pragma(self.db, 'journal_mode'), 'wal')
+        with mock.patch.object(DatabaseWrapper, 'optimize') as optimize:
+            self.db.close()
+        optimize.assert_called_once_with()
+
+    def test_periodic_optimize(self):
+        self.db.ensure_connection()
+        with self.settings(SQLITE_OPTIMIZE_INTERVAL=0), \
+                mock.patch.object(DatabaseWrapper, 'optimize') as optimize:
+            self.db.close_if_unusable_or_obsolete()
+        optimize.assert_called_once_with()
+
+    def test_optimize_never_waits_or_raises(self):
+        '''Занятая база не задерживает и не ломает запрос.'''
+        self.db.ensure_connection()
+        real = self.db.connection
+
+        class LockedConnection:
+            def execute(self, sql):
+                if sql == 'PRAGMA optimize':
+                    raise sqlite3.OperationalError('database is locked')
+                return real.execute(sql)
+
+        self.db.connection = LockedConnection()
+        try:
+            with self.settings(SQLITE_OPTIMIZE_INTERVAL=0):
+                self.db.close_if_unusable_or_obsolete()
+        finally:
+            self.db.connection = real
+        self.assertEqual(pragma(self.db, 'busy_timeout'), 5000)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('sqlite_benchmark', readers=1, writers=1,
+                     seconds=0.2, rows=100, stdout=out)
+        self.assertIn('stock', out.getvalue())
+        self.assertIn('tuned', out.getvalue())
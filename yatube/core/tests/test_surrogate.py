@@ -0,0 +1,68 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.surrogate import HTTPPurgeBackend, tag
+
+SURROGATE_ON = {
+    'ENABLED': True,
+    'HEADER': 'Surrogate-Key',
+    'MAX_AGE': 3600,
+    'BACKEND': 'core.surrogate.HTTPPurgeBackend',
+    'PURGE_URL': None,
+    'PURGE_METHOD': 'PURGE',
+    'PURGE_HEADER': 'xkey-purge',
+    'TIMEOUT': 5,
+}
+
+
+class StubProxy(BaseHTTPRequestHandler):
+    received = []
+
+    def do_PURGE(self):
+        self.received.append((self.command, self.headers['xkey-purge']))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(SURROGATE_KEYS=SURROGATE_ON)
+class SurrogateTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+
+    def test_tag_merges_keys(self):
+        response = tag(self.request, HttpResponse(), 'post-1', 'author-2')
+        tag(self.request, response, 'author-2', 'feed-index')
+        self.assertEqual(response['Surrogate-Key'],
+                         'post-1 author-2 feed-index')
+        self.assertEqual(response['Surrogate-Control'], 'max-age=3600')
+
+    @override_settings(SURROGATE_KEYS={**SURROGATE_ON, 'ENABLED': False})
+    def test_disabled_adds_nothing(self):
+        self.assertFalse(
+            tag(self.request, HttpResponse(), 'post-1')
+            .has_header('Surrogate-Key')
+        )
+
+    def test_http_backend_sends_purge(self):
+        server = HTTPServer(('127.0.0.1', 0), StubProxy)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        host, port = server.server_address
+        try:
+            with self.settings(SURROGATE_KEYS={
+                **SURROGATE_ON, 'PURGE_URL': f'http://{host}:{port}/'
+            }):
+                HTTPPurgeBackend().purge(['post-1', 'feed-index'])
+        finally:
+            thread.join()
+            server.server_close()
+        self.assertEqual(StubProxy.received,
+                         [('PURGE', 'post-1 feed-index')])
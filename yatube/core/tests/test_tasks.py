@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from core.tasks import run_pending, task, task_queue
+
+TEMP_TASKS_DIR = tempfile.mkdtemp()
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+@task
+def fail():
+    raise ValueError('сбой')
+
+
+@override_settings(TASKS={'EAGER': False, 'DIR': TEMP_TASKS_DIR})
+class TaskQueueTests(SimpleTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_TASKS_DIR, ignore_errors=True)
+
+    def setUp(self):
+        calls.clear()
+
+    def put(self, name, *args):
+        task_queue().put({'task': f'{__name__}.{name}', 'args': list(args)})
+
+    def test_duplicate_calls_run_once(self):
+        '''Одинаковые вызовы из одной пачки выполняются один раз.'''
+        for value in ('a', 'b', 'a'):
+            self.put('remember', value)
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, ['a', 'b'])
+        self.assertEqual(run_pending(), 0)
+
+    def test_failed_task_does_not_stop_queue(self):
+        '''Ошибка задачи попадает в лог, остальные выполняются.'''
+        self.put('fail')
+        self.put('remember', 'после')
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            run_pending()
+        self.assertEqual(calls, ['после'])
+
+    @override_settings(TASKS={'EAGER': True, 'DIR': TEMP_TASKS_DIR})
+    def test_eager_runs_immediately(self):
+        remember.delay('сразу')
+        self.assertEqual(calls, ['сразу'])
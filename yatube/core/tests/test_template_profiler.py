@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template import Context, Template, engines
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import template_profiler
+from posts.forms import CommentForm
+from posts.models import Post, User
+
+PROFILE_DIR = tempfile.mkdtemp()
+PROFILER_ON = {'ENABLED': True, 'DIR': PROFILE_DIR, 'DUMP_INTERVAL': 0}
+TEXT_POST_INCLUDE = "{% include 'posts/includes/text_post.html' %}"
+
+
+def reset_template_cache():
+    for loader in engines['django'].engine.template_loaders:
+        if hasattr(loader, 'reset'):
+            loader.reset()
+
+
+@override_settings(TEMPLATE_PROFILER=PROFILER_ON)
+class TemplateProfilerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        reset_template_cache()
+        template_profiler.reset()
+        template_profiler.install()
+
+    def tearDown(self):
+        template_profiler.uninstall()
+        reset_template_cache()
+
+    def rows(self):
+        return {
+            (row['template'], row['node'], row['label']): row
+            for row in template_profiler.snapshot()
+        }
+
+    def test_includes_tags_and_filters_are_timed(self):
+        Client().get(reverse('posts:index'))
+        rows = self.rows()
+        include = rows[('posts/index.html', 'IncludeNode', TEXT_POST_INCLUDE)]
+        self.assertEqual(include['count'], 1)
+        self.assertGreaterEqual(include['total'], include['self'])
+        for key in (
+            ('posts/includes/text_post.html', 'URLNode', '{% url %}'),
+            ('posts/includes/text_post.html', 'filter', '|date'),
+        ):
+            with self.subTest(key=key):
+                self.assertIn(key, rows)
+
+    def test_custom_filter_keeps_working(self):
+        template = Template(
+            '{% load user_filters %}{{ form.text|addclass:"form-control" }}'
+        )
+        html = template.render(Context({'form': CommentForm()}))
+        self.assertIn('class="form-control"', html)
+        self.assertEqual(
+            self.rows()[('<string>', 'filter', '|addclass')]['count'], 1
+        )
+
+    def test_report_command(self):
+        Client().get(reverse('posts:index'))
+        template_profiler.dump()
+        out = StringIO()
+        call_command('template_profile', '--template', 'text_post',
+                     stdout=out)
+        self.assertIn('URLNode {% url %}', out.getvalue())
+        self.assertNotIn('posts/index.html', out.getvalue())
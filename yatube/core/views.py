@@ -1,5 +1,13 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
 
+from . import metrics as prometheus
+
+PROXY_HEADERS = ('HTTP_X_FORWARDED_FOR', 'HTTP_X_REAL_IP', 'HTTP_FORWARDED')
+
 
 def page_not_found(request, exception):
     return render(request, 'core/404.html', {'path': request.path}, status=404)
@@ -15,3 +23,27 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+def metrics_allowed(request):
+    """Запрос с токеном METRICS['TOKEN'] или напрямую с ALLOWED_IPS.
+
+    За обратным прокси REMOTE_ADDR у всех запросов — loopback, поэтому
+    запрос с заголовками прокси по адресу не пускается.
+    """
+    config = settings.METRICS
+    token = config['TOKEN']
+    if token:
+        return hmac.compare_digest(
+            request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'
+        )
+    proxied = any(header in request.META for header in PROXY_HEADERS)
+    return (not proxied
+            and request.META.get('REMOTE_ADDR') in config['ALLOWED_IPS'])
+
+
+def metrics(request):
+    if not settings.METRICS['ENABLED'] or not metrics_allowed(request):
+        raise Http404
+    return HttpResponse(prometheus.collect(),
+                        content_type='text/plain; version=0.0.4')
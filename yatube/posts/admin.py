@@ -1,17 +1,101 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
 
 from .models import Comment, Follow, Group, Post
+from .paginators import EstimatedCountPaginator
 
+CURSOR_VAR = 'after'
 
-class PostAdmin(admin.ModelAdmin):
+
+class KeysetChangeList(ChangeList):
+    """Список объектов админки с пагинацией по ключу вместо OFFSET.
+
+    При сортировке по умолчанию (-pk) следующая страница запрашивается
+    параметром ?after=<pk>, поэтому стоимость страницы не зависит
+    от её номера.
+    """
+
+    def get_queryset(self, request):
+        self.cursor = self.params.pop(CURSOR_VAR, None)
+        queryset = super().get_queryset(request)
+        if self.keyset and self.cursor:
+            try:
+                queryset = queryset.filter(pk__lt=int(self.cursor))
+            except ValueError:
+                self.cursor = None
+        return queryset
+
+    @property
+    def keyset(self):
+        return ORDER_VAR not in self.params
+
+    def get_results(self, request):
+        if not self.keyset:
+            return super().get_results(request)
+        per_page = self.list_per_page
+        pks = list(
+            self.queryset.values_list('pk', flat=True)[:per_page + 1]
+        )
+        self.next_cursor = pks[per_page - 1] if len(pks) > per_page else None
+        self.paginator = self.model_admin.get_paginator(
+            request, self.queryset, per_page
+        )
+        self.result_count = self.paginator.count
+        self.result_list = self.queryset[:per_page]
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = bool(self.next_cursor or self.cursor)
+
+    def next_page_url(self):
+        return self.get_query_string({CURSOR_VAR: self.next_cursor})
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """Общие настройки админки для больших таблиц."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+class PostAdmin(ScalableAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
     empty_value_display = '-пусто-'
 
 
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug')
+    search_fields = ('title', 'slug')
+
+
+class CommentAdmin(ScalableAdmin):
+    list_display = ('pk', 'text', 'created', 'author', 'post')
+    list_select_related = ('author', 'post')
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('post',)
+    search_fields = ('text',)
+    date_hierarchy = 'created'
+    empty_value_display = '-пусто-'
+
+
+class FollowAdmin(ScalableAdmin):
+    list_display = ('pk', 'user', 'author')
+    list_select_related = ('user', 'author')
+    autocomplete_fields = ('user', 'author')
+
+
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
-admin.site.register(Comment)
-admin.site.register(Follow)
+admin.site.register(Group, GroupAdmin)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(Follow, FollowAdmin)
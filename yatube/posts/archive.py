@@ -0,0 +1,149 @@
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+
+from core.surrogate import purge
+
+from .models import (ArchivedComment, ArchivedPost, Comment, Group, Post,
+                     User)
+from .prerender import schedule
+
+POST_FIELDS = ('id', 'text', 'pub_date', 'author_id', 'group_id', 'image')
+COMMENT_FIELDS = ('id', 'text', 'created', 'author_id', 'post_id')
+_local = threading.local()
+
+
+@contextmanager
+def archiving():
+    """Удаления внутри — перенос в архив, а не удаление поста.
+
+    Сигналы не пишут их в журнал изменений (пост по прежнему адресу
+    открывается из архива) и не сбрасывают прокси и готовые страницы
+    построчно: это делает announce_archived() на всю пачку.
+    """
+    _local.archiving = True
+    try:
+        yield
+    finally:
+        _local.archiving = False
+
+
+def is_archiving():
+    return getattr(_local, 'archiving', False)
+
+
+def announce_archived(posts):
+    """Один purge и одна перерисовка на пачку перенесённых постов.
+
+    Архивный пост показывается без формы комментария и пропадает из
+    ленты группы, поэтому его страницы нужно обновить.
+    """
+    purge(*(f'post-{post["id"]}' for post in posts))
+    if not settings.PRERENDER['ENABLED']:
+        return
+    usernames = User.objects.filter(
+        pk__in={post['author_id'] for post in posts}
+    ).values_list('username', flat=True)
+    slugs = Group.objects.filter(
+        pk__in={post['group_id'] for post in posts}
+    ).values_list('slug', flat=True)
+    schedule(
+        reverse('posts:index'),
+        *(reverse('posts:post_detail', args=[post['id']])
+          for post in posts),
+        *(reverse('posts:profile', args=[username])
+          for username in usernames),
+        *(reverse('posts:group_list', args=[slug]) for slug in slugs),
+    )
+
+
+def archive_batch(cutoff, batch_size):
+    """Переносит до batch_size самых старых постов с комментариями.
+
+    Копирование и удаление — в одной транзакции: пост всегда есть
+    ровно в одной из таблиц. Удаление идёт через ORM, поэтому сигналы
+    сбрасывают кеш постов и лент; в журнал изменений оно не попадает.
+    """
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(pub_date__lt=cutoff).order_by('pk')
+            .values(*POST_FIELDS)[:batch_size]
+        )
+        if not posts:
+            return 0, 0
+        ids = [post['id'] for post in posts]
+        comments = list(
+            Comment.objects.filter(post_id__in=ids).values(*COMMENT_FIELDS)
+        )
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(**post) for post in posts
+        )
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(**comment) for comment in comments
+        )
+        with archiving():
+            Post.objects.filter(pk__in=ids).delete()
+        announce_archived(posts)
+    return len(posts), len(comments)
+
+
+def archive_posts(age_days, batch_size, log=None):
+    """Переносит в архив все посты старше age_days дней пачками."""
+    cutoff = timezone.now() - timedelta(days=age_days)
+    total_posts = total_comments = 0
+    while True:
+        posts, comments = archive_batch(cutoff, batch_size)
+        if not posts:
+            return total_posts, total_comments
+        total_posts += posts
+        total_comments += comments
+        if log:
+            log(f'В архиве постов: {total_posts}, '
+                f'комментариев: {total_comments}')
+
+
+def get_post_or_404(post_id, *related):
+    """Пост из горячей таблицы, а если его там нет — из архива."""
+    try:
+        return Post.objects.select_related(*related).get(pk=post_id)
+    except Post.DoesNotExist:
+        return get_object_or_404(
+            ArchivedPost.objects.select_related(*related), pk=post_id
+        )
+
+
+class TieredPosts:
+    """Посты автора для Paginator: сначала горячие, за ними архивные.
+
+    Архивируются посты старше порога, поэтому любой архивный пост
+    старше любого горячего и склейка сохраняет порядок -pub_date.
+    За строками страницы целиком из горячей таблицы в архив
+    не обращается.
+    """
+
+    def __init__(self, hot, archived):
+        self.hot = hot
+        self.archived = archived
+        self._hot_count = None
+
+    def hot_count(self):
+        if self._hot_count is None:
+            self._hot_count = self.hot.count()
+        return self._hot_count
+
+    def count(self):
+        return self.hot_count() + self.archived.count()
+
+    def __getitem__(self, key):
+        start, stop = key.start or 0, key.stop
+        split = self.hot_count()
+        items = list(self.hot[start:min(stop, split)]) if start < split else []
+        if stop > split:
+            items += self.archived[max(start - split, 0):stop - split]
+        return items
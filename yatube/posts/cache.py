@@ -0,0 +1,58 @@
+import hashlib
+
+from django.core.cache import cache
+
+GROUPS = 'groups'
+FEEDS = 'feeds'
+INDEX_PAGE = 'index_page'
+
+
+def post_key(pk):
+    return f'post:{pk}'
+
+
+def get_version(namespace):
+    """Текущая версия пространства ключей кеша."""
+    key = f'version:{namespace}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(namespace):
+    """Делает устаревшими все ключи пространства одним инкрементом."""
+    key = f'version:{namespace}'
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+        return 2
+
+
+def versioned_key(namespace, *parts):
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'{namespace}:{get_version(namespace)}:{digest}'
+
+
+# Ключи прокси-кеша (core.surrogate): страница помечается ключами
+# видимых на ней постов, их авторов и групп, лента — ещё и своим.
+INDEX_FEED = 'feed-index'
+
+
+def feed_key(kind, pk):
+    return f'feed-{kind}-{pk}'
+
+
+def surrogate_keys(post):
+    keys = [f'post-{post.pk}', f'author-{post.author_id}']
+    if post.group_id:
+        keys.append(f'group-{post.group_id}')
+    return keys
+
+
+def page_keys(posts):
+    return [key for post in posts for key in surrogate_keys(post)]
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import Change
+
+
+def log_change(model, instance, parent_id=None, created=None):
+    """Пишет запись в журнал; created=None означает удаление."""
+    if created is None:
+        action = Change.DELETED
+    else:
+        action = Change.CREATED if created else Change.UPDATED
+    Change.objects.create(model=model, action=action,
+                          object_id=instance.pk, parent_id=parent_id)
+
+
+def needs_reset(since):
+    """Клиент отстал дальше, чем хранит журнал после компактизации.
+
+    Самая старая запись журнала остаётся на месте при удалении дублей,
+    поэтому всё, что ниже неё, было удалено именно по сроку хранения.
+    """
+    first = Change.objects.aggregate(first=Min('pk'))['first']
+    return first is not None and since < first - 1
+
+
+def compact(keep_days):
+    """Сжимает журнал изменений.
+
+    Записи старше keep_days дней удаляются, кроме самой новой из них:
+    она остаётся нижней границей для needs_reset. Из оставшихся
+    удаляются записи, перекрытые более поздним изменением того же
+    объекта, — клиенту нужна только последняя.
+    """
+    cutoff = timezone.now() - timedelta(days=keep_days)
+    floor = (
+        Change.objects.filter(created__lt=cutoff)
+        .aggregate(last=Max('pk'))['last']
+    )
+    expired = 0
+    if floor is not None:
+        expired, _ = Change.objects.filter(pk__lt=floor).delete()
+    else:
+        floor = Change.objects.aggregate(first=Min('pk'))['first'] or 0
+    latest = (
+        Change.objects.filter(pk__gt=floor)
+        .values('model', 'object_id')
+        .annotate(last=Max('pk'))
+        .values('last')
+    )
+    superseded, _ = (
+        Change.objects.filter(pk__gt=floor)
+        .exclude(pk__in=latest)
+        .delete()
+    )
+    return expired, superseded
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.journal import JournalQueue
+
+from .models import Comment, Post, User
+from .utils import no_auto_now
+
+
+def comment_queue():
+    return JournalQueue(settings.COMMENT_QUEUE_DIR, 'comments')
+
+
+def enqueue_comment(post, author, text):
+    comment_queue().put({
+        'post': post.id,
+        'author': author.id,
+        'text': text,
+        'created': timezone.now().isoformat(),
+    })
+
+
+def to_comment(item, author=None):
+    comment = Comment(post_id=item['post'], author_id=item['author'],
+                      text=item['text'],
+                      created=parse_datetime(item['created']))
+    if author is not None:
+        comment.author = author
+    return comment
+
+
+def pending_comments(post_id, author):
+    """Ещё не записанные комментарии автора: он видит их сразу.
+
+    Между записью пачки и ack() комментарий есть и в базе, и в очереди;
+    такие отбрасываются, чтобы не показать его дважды.
+    """
+    items = [
+        item for item in comment_queue().items()
+        if item['post'] == post_id and item['author'] == author.id
+    ]
+    if not items:
+        return []
+    return [
+        to_comment(item, author)
+        for item, saved in zip(items, already_saved(items)) if not saved
+    ]
+
+
+def already_saved(items):
+    """Записи, которые уже попали в базу до сбоя прошлого сброса."""
+    saved = set(
+        Comment.objects.filter(
+            created__in=[parse_datetime(item['created']) for item in items]
+        ).values_list('post_id', 'author_id', 'created')
+    )
+    return [
+        (item['post'], item['author'], parse_datetime(item['created']))
+        in saved
+        for item in items
+    ]
+
+
+def flush_comments(batch_size=None):
+    """Записывает очередь пачками, по транзакции на пачку.
+
+    Комментарии сохраняются через save(), чтобы сработали сигналы
+    журнала изменений и кеша, но внутри одной транзакции на пачку:
+    SQLite берёт блокировку записи один раз, а не на каждый комментарий.
+    Возвращает число записанных комментариев.
+    """
+    batch_size = batch_size or settings.COMMENT_FLUSH_BATCH
+    queue = comment_queue()
+    items, resumed = queue.take()
+    if resumed:
+        items = [
+            item for item, saved in zip(items, already_saved(items))
+            if not saved
+        ]
+    written = 0
+    with no_auto_now(Comment, 'created'):
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            # Пост или автора могли удалить, пока комментарий ждал.
+            posts = set(Post.objects.filter(
+                pk__in={item['post'] for item in batch}
+            ).values_list('pk', flat=True))
+            authors = set(User.objects.filter(
+                pk__in={item['author'] for item in batch}
+            ).values_list('pk', flat=True))
+            with transaction.atomic():
+                for item in batch:
+                    if item['post'] in posts and item['author'] in authors:
+                        to_comment(item).save()
+                        written += 1
+    queue.ack()
+    return written
@@ -0,0 +1,153 @@
+import json
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+
+from .models import Change
+
+CHANGE_FIELDS = ('id', 'model', 'action', 'object_id', 'parent_id')
+
+
+class ChangeBroker:
+    """Один опрос журнала изменений на процесс для всех подписчиков.
+
+    Фоновый поток раз в EVENTS_POLL_INTERVAL секунд читает новые записи
+    Change и раскладывает их по очередям подписчиков, поэтому открытое
+    SSE-соединение само в базу не ходит. Поток живёт, пока есть
+    подписчики.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.last_seq = None
+        self.thread = None
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        self.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(
+                target=self.run, name='change-broker', daemon=True
+            )
+            self.thread.start()
+
+    def run(self):
+        try:
+            while True:
+                # Под замком: подписчик, пришедший после проверки,
+                # увидит thread = None и start() запустит новый поток.
+                # Новый поток начнёт с головы журнала, а не перескажет
+                # изменения, сделанные, пока опроса не было.
+                with self.lock:
+                    if not self.subscribers:
+                        self.thread = None
+                        self.last_seq = None
+                        return
+                self.poll_once()
+                time.sleep(settings.EVENTS_POLL_INTERVAL)
+        finally:
+            connection.close()
+
+    def poll_once(self):
+        if self.last_seq is None:
+            self.last_seq = (
+                Change.objects.aggregate(last=Max('pk'))['last'] or 0
+            )
+        changes = list(
+            Change.objects.filter(pk__gt=self.last_seq)
+            .values(*CHANGE_FIELDS)[:settings.EVENTS_BATCH_SIZE]
+        )
+        if not changes:
+            return
+        self.last_seq = changes[-1]['id']
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(changes)
+            except queue.Full:
+                # Медленный клиент: отключаем, браузер переподключится.
+                self.unsubscribe(subscriber)
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(None)
+
+
+broker = ChangeBroker()
+
+
+def wait_for_changes(fetch, timeout):
+    """Long poll: fetch() повторяется после первой пачки изменений.
+
+    Подписка оформляется до первого fetch(), чтобы изменение, попавшее
+    между запросом и ожиданием, не потерялось.
+    """
+    subscriber = broker.subscribe()
+    try:
+        result = fetch()
+        if not result and timeout > 0:
+            try:
+                subscriber.get(timeout=timeout)
+            except queue.Empty:
+                return result
+            result = fetch()
+        return result
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+def format_event(event, data, seq=None):
+    lines = [f'id: {seq}'] if seq is not None else []
+    lines += [f'event: {event}', f'data: {json.dumps(data)}']
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(post_id=None):
+    """Поток SSE: счётчик новых постов или новые комментарии к посту."""
+    subscriber = broker.subscribe()
+    deadline = time.monotonic() + settings.EVENTS_MAX_AGE
+    new_posts = 0
+    try:
+        yield 'retry: {}\n\n'.format(settings.EVENTS_RETRY * 1000)
+        while time.monotonic() < deadline:
+            try:
+                changes = subscriber.get(
+                    timeout=settings.EVENTS_KEEPALIVE
+                )
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            if changes is None:
+                return
+            for change in changes:
+                if change['action'] != Change.CREATED:
+                    continue
+                if post_id is None and change['model'] == Change.POST:
+                    new_posts += 1
+                    yield format_event(
+                        'posts', {'count': new_posts}, change['id']
+                    )
+                elif (post_id is not None
+                      and change['model'] == Change.COMMENT
+                      and change['parent_id'] == post_id):
+                    yield format_event(
+                        'comment', {'id': change['object_id']}, change['id']
+                    )
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,160 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from core.surrogate import tag
+
+from .cache import (FEEDS, INDEX_FEED, feed_key, surrogate_keys,
+                    versioned_key)
+from .models import Group, Post, User
+
+
+class SnapshotFeed(Feed):
+    """Лента из закешированного снимка последних FEED_SIZE постов.
+
+    Снимок хранится под версией FEEDS, которую сдвигает любое изменение
+    поста, группы или пользователя. ETag — хеш содержимого снимка: версия
+    после вытеснения из кеша может повториться, а хеш совпадёт только
+    у одинаковых лент. Пока снимок в кеше, ETag не обращается к базе.
+    """
+    kind = None
+
+    def snapshot(self, **kwargs):
+        key = versioned_key(FEEDS, self.kind, *sorted(kwargs.items()))
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = self.build(**kwargs)
+            posts = snapshot.pop('posts')
+            snapshot['items'] = [
+                {
+                    'id': post.id,
+                    'text': post.text,
+                    'pub_date': post.pub_date,
+                    'author': post.author.get_full_name()
+                    or post.author.username,
+                    'keys': surrogate_keys(post),
+                }
+                for post in posts.select_related('author')[
+                    :settings.FEED_SIZE
+                ]
+            ]
+            snapshot['digest'] = hashlib.md5(repr((
+                snapshot['title'], snapshot['description'],
+                [(item['id'], item['pub_date'].isoformat(), item['text'],
+                  item['author']) for item in snapshot['items']],
+            )).encode()).hexdigest()
+            cache.set(key, snapshot, settings.FEED_CACHE_TIMEOUT)
+        return snapshot
+
+    def etag(self, request, **kwargs):
+        return '"{}-{}"'.format(
+            self.snapshot(**kwargs)['digest'], self.feed_type.__name__
+        )
+
+    def last_modified(self, request, **kwargs):
+        items = self.snapshot(**kwargs)['items']
+        return items[0]['pub_date'] if items else None
+
+    def __call__(self, request, *args, **kwargs):
+        response = super().__call__(request, *args, **kwargs)
+        snapshot = self.snapshot(**kwargs)
+        return tag(request, response, *snapshot['keys'], *(
+            key for item in snapshot['items'] for key in item['keys']
+        ))
+
+    def as_view(self):
+        return condition(
+            etag_func=self.etag, last_modified_func=self.last_modified
+        )(self)
+
+    def get_object(self, request, **kwargs):
+        return self.snapshot(**kwargs)
+
+    def title(self, obj):
+        return obj['title']
+
+    def link(self, obj):
+        return obj['link']
+
+    def description(self, obj):
+        return obj['description']
+
+    def subtitle(self, obj):
+        return obj['description']
+
+    def items(self, obj):
+        return obj['items']
+
+    def item_title(self, item):
+        return item['text'][:50]
+
+    def item_description(self, item):
+        return item['text']
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', kwargs={'post_id': item['id']})
+
+    def item_pubdate(self, item):
+        return item['pub_date']
+
+    def item_author_name(self, item):
+        return item['author']
+
+
+class LatestPostsFeed(SnapshotFeed):
+    kind = 'index'
+
+    def build(self):
+        return {
+            'title': 'Yatube: последние обновления на сайте',
+            'link': reverse('posts:index'),
+            'description': 'Новые посты всех авторов',
+            'posts': Post.objects.all(),
+            'keys': [INDEX_FEED],
+        }
+
+
+class GroupPostsFeed(SnapshotFeed):
+    kind = 'group'
+
+    def build(self, slug):
+        group = get_object_or_404(Group, slug=slug)
+        return {
+            'title': f'Yatube: {group.title}',
+            'link': reverse('posts:group_list', kwargs={'slug': slug}),
+            'description': group.description,
+            'posts': group.posts.all(),
+            'keys': [f'group-{group.pk}', feed_key('group', group.pk)],
+        }
+
+
+class AuthorPostsFeed(SnapshotFeed):
+    kind = 'profile'
+
+    def build(self, username):
+        author = get_object_or_404(User, username=username)
+        return {
+            'title': f'Yatube: посты {author.get_full_name() or username}',
+            'link': reverse('posts:profile', kwargs={'username': username}),
+            'description': f'Новые посты пользователя {username}',
+            'posts': author.posts.all(),
+            'keys': [f'author-{author.pk}', feed_key('author', author.pk)],
+        }
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
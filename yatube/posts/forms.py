@@ -1,6 +1,7 @@
 from django import forms
 
 from .models import Comment, Post
+from .widgets import GroupAutocompleteWidget
 
 
 class PostForm(forms.ModelForm):
@@ -12,6 +13,7 @@ class PostForm(forms.ModelForm):
             'text': 'Текст нового поста',
             'group': 'Пост будет относиться к этой группе',
         }
+        widgets = {'group': GroupAutocompleteWidget}
 
 
 class CommentForm(forms.ModelForm):
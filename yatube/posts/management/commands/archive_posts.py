@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = ('Переносит старые посты с комментариями в архивные таблицы '
+            '(запускать по расписанию, например cron)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--age-days', type=int, default=settings.ARCHIVE_AGE_DAYS,
+            help='Посты старше скольких дней переносить'
+        )
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        posts, comments = archive_posts(
+            options['age_days'], options['batch_size'], self.stdout.write
+        )
+        self.stdout.write(
+            f'Перенесено в архив постов: {posts}, комментариев: {comments}'
+        )
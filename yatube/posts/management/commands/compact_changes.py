@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.changes import compact
+
+
+class Command(BaseCommand):
+    help = 'Сжимает журнал изменений (запускать по расписанию, например cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days', type=int, default=settings.CHANGES_KEEP_DAYS,
+            help='Сколько дней хранить записи журнала'
+        )
+
+    def handle(self, *args, **options):
+        expired, superseded = compact(options['keep_days'])
+        self.stdout.write(
+            f'Удалено устаревших записей: {expired}, '
+            f'перекрытых более поздними: {superseded}'
+        )
@@ -0,0 +1,39 @@
+import fcntl
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.comment_buffer import flush_comments
+
+
+class Command(BaseCommand):
+    help = ('Записывает отложенные комментарии в базу. '
+            'Одновременно может работать только один экземпляр.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно')
+        parser.add_argument('--interval', type=float, default=0.5,
+                            help='Пауза между сбросами в секундах')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.COMMENT_FLUSH_BATCH)
+
+    def handle(self, *args, **options):
+        os.makedirs(settings.COMMENT_QUEUE_DIR, exist_ok=True)
+        writer_lock = open(
+            os.path.join(settings.COMMENT_QUEUE_DIR, 'writer.lock'), 'a'
+        )
+        try:
+            fcntl.flock(writer_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise CommandError('flush_comments уже запущен')
+        with writer_lock:
+            while True:
+                written = flush_comments(options['batch_size'])
+                if written:
+                    self.stdout.write(f'Записано комментариев: {written}')
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
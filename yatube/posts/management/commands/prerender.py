@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.prerender import render_page
+
+
+def all_pages():
+    yield reverse('posts:index')
+    for slug in Group.objects.values_list('slug', flat=True).iterator():
+        yield reverse('posts:group_list', args=[slug])
+    for username in User.objects.values_list('username',
+                                             flat=True).iterator():
+        yield reverse('posts:profile', args=[username])
+    for pk in Post.objects.values_list('pk', flat=True).iterator():
+        yield reverse('posts:post_detail', args=[pk])
+
+
+class Command(BaseCommand):
+    help = 'Перерисовывает готовые страницы для анонимов (PRERENDER)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help='Адреса страниц, например /group/cats/')
+        parser.add_argument('--all', action='store_true',
+                            help='Все страницы: главная, группы, профили, '
+                                 'посты')
+
+    def handle(self, *args, **options):
+        paths = all_pages() if options['all'] else options['paths']
+        count = 0
+        for path in paths:
+            render_page(path)
+            count += 1
+        self.stdout.write(f'Перерисовано страниц: {count}')
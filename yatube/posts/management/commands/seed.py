@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.models import Post
+from posts.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу синтетическими данными: пользователи, группы, '
+            'посты, подписки и комментарии')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=3000000,
+                            help='Примерное число комментариев')
+        parser.add_argument('--follows', type=int, default=20,
+                            help='Среднее число подписок пользователя')
+        parser.add_argument('--images', type=float, default=0.1,
+                            help='Доля постов с картинкой')
+        parser.add_argument('--days', type=int, default=365,
+                            help='За сколько дней распределить посты')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='password',
+                            help='Пароль всех созданных пользователей')
+        parser.add_argument('--force', action='store_true',
+                            help='Добавить данные в непустую базу')
+
+    def handle(self, *args, **options):
+        if Post.objects.exists() and not options['force']:
+            raise CommandError('В базе уже есть посты; используйте --force')
+        verbosity = options['verbosity']
+        seeder = Seeder(
+            options['seed'], options['batch_size'],
+            log=self.stdout.write if verbosity > 1 else None
+        )
+        started = time.monotonic()
+        steps = (
+            ('пользователей', seeder.users,
+             (options['users'], options['password'])),
+            ('групп', seeder.groups, (options['groups'],)),
+            ('постов', seeder.posts,
+             (options['posts'], options['days'], options['images'])),
+            ('подписок', seeder.follows, (options['follows'],)),
+            ('комментариев', seeder.comments, (options['comments'],)),
+        )
+        for label, step, arguments in steps:
+            step_started = time.monotonic()
+            created = step(*arguments)
+            self.stdout.write(
+                f'Создано {label}: {created} '
+                f'за {time.monotonic() - step_started:.1f} с'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.monotonic() - started:.1f} с'
+        ))
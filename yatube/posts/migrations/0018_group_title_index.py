@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_pub_date_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='group',
+            name='title',
+            field=models.CharField(db_index=True, max_length=200, verbose_name='Группа'),
+        ),
+    ]
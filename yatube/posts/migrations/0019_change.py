@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_group_title_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('post', 'Пост'), ('comment', 'Комментарий')], max_length=16, verbose_name='Модель')),
+                ('action', models.CharField(choices=[('created', 'Создание'), ('updated', 'Изменение'), ('deleted', 'Удаление')], max_length=16, verbose_name='Действие')),
+                ('object_id', models.PositiveIntegerField(verbose_name='id объекта')),
+                ('parent_id', models.PositiveIntegerField(blank=True, help_text='Пост, к которому относится комментарий', null=True, verbose_name='id родителя')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Изменение',
+                'verbose_name_plural': 'Изменения',
+                'ordering': ('pk',),
+            },
+        ),
+    ]
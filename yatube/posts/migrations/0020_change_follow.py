@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_change'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='change',
+            name='model',
+            field=models.CharField(choices=[('post', 'Пост'), ('comment', 'Комментарий'), ('follow', 'Подписка')], max_length=16, verbose_name='Модель'),
+        ),
+        migrations.AlterField(
+            model_name='change',
+            name='parent_id',
+            field=models.PositiveIntegerField(blank=True, help_text='Пост комментария или подписчик в подписке', null=True, verbose_name='id родителя'),
+        ),
+    ]
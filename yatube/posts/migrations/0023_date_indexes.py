@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0022_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedpost',
+            index=models.Index(fields=['group', 'pub_date'], name='archived_group_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedpost',
+            index=models.Index(fields=['author', 'pub_date'], name='archived_author_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', 'pub_date'], name='post_group_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'pub_date'], name='post_author_date_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0023_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='change',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата изменения'),
+        ),
+    ]
@@ -6,7 +6,8 @@ User = get_user_model()
 
 class Group(models.Model):
     title = models.CharField('Группа',
-                             max_length=200)
+                             max_length=200,
+                             db_index=True)
     slug = models.SlugField(unique=True)
     description = models.TextField('Группа')
 
@@ -23,6 +24,7 @@ class Post(models.Model):
                             help_text='Введите текст поста')
     pub_date = models.DateTimeField('Дата публикации',
                                     auto_now_add=True,
+                                    db_index=True,
                                     help_text='Дата публикации')
 
     author = models.ForeignKey(
@@ -49,10 +51,18 @@ class Post(models.Model):
         blank=True
     )
 
+    archived = False
+
     class Meta:
         verbose_name = "Пост"
         verbose_name_plural = 'Посты'
         ordering = ('-pub_date', )
+        indexes = [
+            models.Index(fields=['group', 'pub_date'],
+                         name='post_group_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='post_author_date_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.text[:15]
@@ -65,7 +75,8 @@ class Comment(models.Model):
     )
     created = models.DateTimeField(
         'Дата комментария',
-        auto_now_add=True
+        auto_now_add=True,
+        db_index=True
     )
     author = models.ForeignKey(
         User,
@@ -83,6 +94,77 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['post', 'created'],
+                         name='comment_post_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedPost(models.Model):
+    """Пост старше ARCHIVE['AGE_DAYS']; pk совпадает с pk в Post."""
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст поста')
+    pub_date = models.DateTimeField('Дата публикации', db_index=True)
+    author = models.ForeignKey(
+        User,
+        verbose_name='Автор',
+        on_delete=models.CASCADE,
+        related_name='archived_posts'
+    )
+    group = models.ForeignKey(
+        Group,
+        verbose_name='Группа',
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts'
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+
+    archived = True
+
+    class Meta:
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+        ordering = ('-pub_date', )
+        indexes = [
+            models.Index(fields=['group', 'pub_date'],
+                         name='archived_group_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='archived_author_date_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст комментария')
+    created = models.DateTimeField('Дата комментария')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='Автор'
+    )
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Пост'
+    )
+
+    class Meta:
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+        indexes = [
+            models.Index(fields=['post', 'created'],
+                         name='archived_comment_post_idx'),
+        ]
 
     def __str__(self):
         return self.text[:15]
@@ -104,3 +186,45 @@ class Follow(models.Model):
                 fields=['user', 'author'], name='unique_follow'
             )
         ]
+
+
+class Change(models.Model):
+    """Журнал изменений: номер записи (pk) растёт монотонно."""
+    POST = 'post'
+    COMMENT = 'comment'
+    FOLLOW = 'follow'
+    MODEL_CHOICES = (
+        (POST, 'Пост'),
+        (COMMENT, 'Комментарий'),
+        (FOLLOW, 'Подписка'),
+    )
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = (
+        (CREATED, 'Создание'),
+        (UPDATED, 'Изменение'),
+        (DELETED, 'Удаление'),
+    )
+
+    model = models.CharField('Модель', max_length=16,
+                             choices=MODEL_CHOICES)
+    action = models.CharField('Действие', max_length=16,
+                              choices=ACTION_CHOICES)
+    object_id = models.PositiveIntegerField('id объекта')
+    parent_id = models.PositiveIntegerField(
+        'id родителя',
+        null=True,
+        blank=True,
+        help_text='Пост комментария или подписчик в подписке'
+    )
+    created = models.DateTimeField('Дата изменения', auto_now_add=True,
+                                   db_index=True)
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Изменения'
+        ordering = ('pk',)
+
+    def __str__(self):
+        return f'{self.pk}: {self.model} {self.object_id} {self.action}'
@@ -0,0 +1,110 @@
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models.functions import TruncMonth
+from django.http import Http404
+from django.utils import timezone
+
+from core.tasks import task
+
+
+def month_bounds(year, month):
+    """Начало месяца и начало следующего, в текущем часовом поясе."""
+    try:
+        start = timezone.make_aware(datetime(year, month, 1))
+        if month == 12:
+            end = start.replace(year=year + 1, month=1)
+        else:
+            end = start.replace(month=month + 1)
+    except (ValueError, OverflowError):
+        raise Http404('Нет такого месяца')
+    return start, end
+
+
+def is_complete(end):
+    """Месяц целиком старше порога архивации — его посты не меняются.
+
+    Архивные посты нельзя править и комментировать; правки групп и
+    пользователей, которые видны на странице, сбрасывают файлы через
+    clear_pages().
+    """
+    return end <= timezone.now() - timedelta(days=settings.ARCHIVE_AGE_DAYS)
+
+
+def page_path(scope, year, month, page):
+    return os.path.join(settings.ARCHIVE_PAGES_DIR, *scope,
+                        f'{year:04d}-{month:02d}-{page}.html')
+
+
+def read_page(path):
+    """Ключи Surrogate-Key и HTML сохранённой страницы или None."""
+    try:
+        with open(path, 'rb') as file:
+            keys = file.readline().decode().split()
+            return keys, file.read()
+    except FileNotFoundError:
+        return None
+
+
+def save_page(path, keys, content):
+    """Пишет страницу; первая строка файла — её ключи Surrogate-Key."""
+    write_page(path, ' '.join(keys).encode() + b'\n' + content)
+
+
+def affected_pages(posts):
+    """Сохранённые страницы, на которых показаны посты архива posts.
+
+    Пост виден в месяце сайта, своей группы и своего автора. Список
+    [scope, год, месяц] годится в аргументы задачи clear_pages.
+    """
+    months = (
+        posts.annotate(month=TruncMonth('pub_date')).order_by()
+        .values_list('month', 'group__slug', 'author__username').distinct()
+    )
+    pages = set()
+    for month, slug, username in months:
+        scopes = [('site',), ('author', f'@{username}')]
+        if slug:
+            scopes.append(('group', slug))
+        for scope in scopes:
+            pages.add((scope, month.year, month.month))
+    return [[list(scope), year, month] for scope, year, month
+            in sorted(pages)]
+
+
+@task
+def clear_pages(pages):
+    """Удаляет сохранённые страницы [scope, год, месяц] всех номеров."""
+    for scope, year, month in pages:
+        directory = os.path.dirname(page_path(scope, year, month, 1))
+        prefix = f'{year:04d}-{month:02d}-'
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in names:
+            if name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+def write_page(path, content):
+    """Атомарная запись: параллельный читатель не увидит половину файла."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def neighbours(year, month):
+    """Соседние месяцы (year, month); следующего нет для текущего."""
+    previous = (year - 1, 12) if month == 1 else (year, month - 1)
+    following = (year + 1, 1) if month == 12 else (year, month + 1)
+    today = timezone.localdate()
+    if following > (today.year, today.month):
+        following = None
+    return previous, following
@@ -0,0 +1,148 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+def estimate_table_rows(model, using='default'):
+    """Оценка числа строк таблицы без полного COUNT(*).
+
+    Для SQLite берётся статистика ANALYZE (sqlite_stat1), а если её нет —
+    максимальный первичный ключ, который читается из индекса за O(log n).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [table]
+            )
+            row = cursor.fetchone()
+            if row and row[0] > 0:
+                return row[0]
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone():
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [table]
+                )
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0].split()[0])
+        pk_column = model._meta.pk.column
+        cursor.execute(
+            'SELECT MAX({}) FROM {}'.format(
+                connection.ops.quote_name(pk_column),
+                connection.ops.quote_name(table),
+            )
+        )
+        row = cursor.fetchone()
+    return row[0] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, который не считает всю таблицу целиком.
+
+    Без фильтров число строк берётся из статистики таблицы, с фильтрами —
+    считается не дальше ESTIMATED_COUNT_LIMIT записей.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.where:
+            return estimate_table_rows(queryset.model, queryset.db)
+        limit = settings.ESTIMATED_COUNT_LIMIT
+        return queryset.order_by().values('pk')[:limit].count()
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class CursorPaginator:
+    """Пагинация по ключу сортировки вместо OFFSET.
+
+    ordering — два поля, например ('-pub_date', '-pk'): второе делает
+    ключ уникальным. Курсор хранит значения этих полей последней
+    записи страницы, следующая страница начинается сразу после неё,
+    поэтому её стоимость не зависит от глубины листания.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-pk')):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.descending = ordering[0].startswith('-')
+
+    def _model_field(self, name):
+        opts = self.queryset.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def encode(self, item):
+        values = []
+        for name in self.fields:
+            if isinstance(item, dict):
+                value = item[name if name in item else 'id']
+            else:
+                value = getattr(item, name)
+            values.append(
+                value.isoformat() if hasattr(value, 'isoformat')
+                else str(value)
+            )
+        return urlsafe_b64encode('|'.join(values).encode()).decode()
+
+    def decode(self, cursor):
+        try:
+            raw = urlsafe_b64decode(cursor.encode()).decode()
+            parts = raw.split('|')
+            if len(parts) != len(self.fields):
+                raise ValueError(raw)
+            return [
+                self._model_field(name).to_python(value)
+                for name, value in zip(self.fields, parts)
+            ]
+        except (ValueError, UnicodeDecodeError, ValidationError) as error:
+            raise InvalidCursor(cursor) from error
+
+    def page(self, cursor=None):
+        queryset = self.queryset
+        if cursor:
+            first, second = self.decode(cursor)
+            lookup = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.fields[0]}__{lookup}': first})
+                | Q(**{self.fields[0]: first,
+                       f'{self.fields[1]}__{lookup}': second})
+            )
+        items = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(items) > self.per_page:
+            items = items[:self.per_page]
+            next_cursor = self.encode(items[-1])
+        return CursorPage(items, next_cursor)
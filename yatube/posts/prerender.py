@@ -0,0 +1,115 @@
+"""Готовый HTML страниц для анонимных читателей.
+
+Файл страницы /path/ лежит в PRERENDER['DIR']/path/index.html. Фронтовой
+сервер отдаёт его сам на GET без cookie sessionid и без параметров,
+например в nginx: try_files /prerendered$uri/index.html @django.
+Django остаются промахи, следующие страницы лент и вошедшие
+пользователи.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler, WSGIRequest
+from django.urls import reverse
+from django.utils.cache import get_cache_key
+
+from core.tasks import task
+
+from .cache import INDEX_PAGE
+from .models import Comment, Post
+from .month_archive import write_page
+
+_handler = None
+
+
+def file_path(path):
+    return os.path.join(settings.PRERENDER['DIR'], path.strip('/'),
+                        'index.html')
+
+
+def anonymous_request(path, pinned=False):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'SERVER_NAME': settings.PRERENDER['HOST'],
+        'SERVER_PORT': '443',
+        'wsgi.url_scheme': 'https',
+        'wsgi.input': io.BytesIO(),
+    }
+    if pinned:
+        # Как после записи: view с use_replica читают с primary, а не с
+        # отстающей реплики.
+        environ['HTTP_COOKIE'] = f"{settings.REPLICA_ROUTING['PIN_COOKIE']}=1"
+    return WSGIRequest(environ)
+
+
+def post_pages(post, group_slug=None):
+    """Страницы, на которых виден пост, и прежняя группа поста."""
+    pages = [
+        reverse('posts:index'),
+        reverse('posts:post_detail', args=[post.pk]),
+        reverse('posts:profile', args=[post.author.username]),
+    ]
+    if post.group_id:
+        pages.append(reverse('posts:group_list', args=[post.group.slug]))
+    if group_slug:
+        pages.append(reverse('posts:group_list', args=[group_slug]))
+    return pages
+
+
+def group_pages(group_pk, slug):
+    """Лента группы и страницы, где карточки её постов ссылаются на неё."""
+    pages = [reverse('posts:index'),
+             reverse('posts:group_list', args=[slug])]
+    posts = Post.objects.filter(group=group_pk)
+    for pk, username in posts.values_list('pk', 'author__username'):
+        pages.append(reverse('posts:post_detail', args=[pk]))
+        pages.append(reverse('posts:profile', args=[username]))
+    return pages
+
+
+def author_pages(user_pk, username):
+    """Профиль и страницы, где видны имя автора или ссылка на него."""
+    pages = [reverse('posts:index'),
+             reverse('posts:profile', args=[username])]
+    posts = Post.objects.filter(author=user_pk)
+    for pk, slug in posts.values_list('pk', 'group__slug'):
+        pages.append(reverse('posts:post_detail', args=[pk]))
+        if slug:
+            pages.append(reverse('posts:group_list', args=[slug]))
+    commented = Comment.objects.filter(author=user_pk)
+    for pk in commented.values_list('post_id', flat=True).distinct():
+        pages.append(reverse('posts:post_detail', args=[pk]))
+    return pages
+
+
+def schedule(*paths):
+    for path in dict.fromkeys(paths):
+        render_page.delay(path)
+
+
+@task
+def render_page(path):
+    """Рисует страницу как для анонима и пишет файл; не 200 — удаляет.
+
+    Копию главной из cache_page сначала удаляем, иначе в файл попала
+    бы страница до последнего изменения.
+    """
+    global _handler
+    if _handler is None:
+        _handler = WSGIHandler()
+    for pinned in (False, True):
+        key = get_cache_key(anonymous_request(path, pinned),
+                            key_prefix=INDEX_PAGE)
+        if key is not None:
+            cache.delete(key)
+    response = _handler.get_response(anonymous_request(path, pinned=True))
+    if response.status_code == 200:
+        write_page(file_path(path), response.content)
+    else:
+        try:
+            os.remove(file_path(path))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,232 @@
+import io
+import itertools
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+from PIL import Image
+
+from .models import Comment, Follow, Group, Post, User
+from .utils import no_auto_now
+
+SENTENCE_POOL = 5000
+IMAGE_POOL = 20
+IMAGE_DIR = 'posts/seed'
+# Показатели степенных законов: чем меньше, тем сильнее перекос
+# в сторону популярных авторов, длинных обсуждений и числа подписок.
+AUTHOR_SKEW = 1.1
+TAIL_ALPHA = 1.3
+MAX_THREAD = 2000
+
+
+def zipf_weights(count, skew):
+    """Накопленные веса ранга i ~ 1 / (i + 1) ** skew для random.choices."""
+    return list(itertools.accumulate(
+        1 / (rank + 1) ** skew for rank in range(count)
+    ))
+
+
+def pareto_size(rng, mean):
+    """Целое из распределения Парето со средним около mean.
+
+    Случайное округление сохраняет среднее и для mean меньше единицы.
+    """
+    scale = mean * (TAIL_ALPHA - 1) / TAIL_ALPHA
+    return int(rng.paretovariate(TAIL_ALPHA) * scale + rng.random())
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def first_free_number(model):
+    """Номер, с которого нумеровать имена новых записей.
+
+    Номер каждой созданной записи меньше её pk, поэтому имена от
+    наибольшего pk не совпадут с созданными прошлыми запусками seed.
+    """
+    return model.objects.aggregate(top=Max('pk'))['top'] or 0
+
+
+class Seeder:
+    """Генератор синтетических данных для нагрузочных проверок.
+
+    Все случайные величины берутся из одного random.Random(seed), так
+    что одинаковые параметры дают одинаковую базу. Тексты собираются
+    из заранее сгенерированного Faker пула предложений: вызывать Faker
+    на каждую строку при миллионах записей слишком медленно.
+    """
+
+    def __init__(self, seed=1, batch_size=5000, log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        fake = Faker('ru_RU')
+        fake.seed_instance(seed)
+        self.sentences = [fake.sentence() for _ in range(SENTENCE_POOL)]
+        self.first_names = [fake.first_name() for _ in range(500)]
+        self.last_names = [fake.last_name() for _ in range(500)]
+        self.now = timezone.now()
+
+    def text(self, low, high):
+        return ' '.join(
+            self.rng.choices(self.sentences, k=self.rng.randint(low, high))
+        )
+
+    def insert(self, model, objects, total):
+        done = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            done += len(batch)
+            self.log(f'{model._meta.verbose_name_plural}: {done}/{total}')
+        return done
+
+    def users(self, count, password='password', prefix='user'):
+        password = make_password(password)
+        rng = self.rng
+        start = first_free_number(User)
+        return self.insert(User, (
+            User(username=f'{prefix}{i}', password=password,
+                 first_name=rng.choice(self.first_names),
+                 last_name=rng.choice(self.last_names))
+            for i in range(start, start + count)
+        ), count)
+
+    def groups(self, count):
+        start = first_free_number(Group)
+        return self.insert(Group, (
+            Group(title=f'Группа {i}', slug=f'group-{i}',
+                  description=self.text(1, 3))
+            for i in range(start, start + count)
+        ), count)
+
+    def images(self):
+        names = []
+        for number in range(IMAGE_POOL):
+            name = f'{IMAGE_DIR}/seed_{number}.jpg'
+            if not default_storage.exists(name):
+                color = tuple(self.rng.randrange(256) for _ in range(3))
+                buffer = io.BytesIO()
+                Image.new('RGB', (960, 540), color).save(buffer, 'JPEG')
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+            names.append(name)
+        return names
+
+    def posts(self, count, days=365, image_fraction=0.1,
+              group_fraction=0.7):
+        """Посты по возрастанию даты: pk растёт вместе с pub_date.
+
+        Авторы выбираются по закону Ципфа — немногие пишут большую
+        часть постов.
+        """
+        rng = self.rng
+        author_ids = list(User.objects.order_by('pk')
+                          .values_list('pk', flat=True))
+        rng.shuffle(author_ids)
+        weights = zipf_weights(len(author_ids), AUTHOR_SKEW)
+        group_ids = list(Group.objects.values_list('pk', flat=True))
+        images = self.images() if image_fraction else []
+        step = timedelta(days=days) / max(count, 1)
+        start = self.now - timedelta(days=days)
+
+        def generate():
+            for i in range(count):
+                yield Post(
+                    text=self.text(1, 6),
+                    pub_date=start + step * i,
+                    author_id=rng.choices(author_ids, cum_weights=weights)[0],
+                    group_id=(rng.choice(group_ids)
+                              if group_ids and rng.random() < group_fraction
+                              else None),
+                    image=(rng.choice(images)
+                           if images and rng.random() < image_fraction
+                           else ''),
+                )
+
+        with no_auto_now(Post, 'pub_date'):
+            return self.insert(Post, generate(), count)
+
+    def follows(self, per_user):
+        """Граф подписок со степенным распределением.
+
+        Число подписок пользователя — из распределения Парето со средним
+        около per_user, выбор автора — пропорционально его популярности.
+        Подписки получают только пользователи, у которых их ещё нет.
+        """
+        rng = self.rng
+        popular = list(User.objects.order_by('pk')
+                       .values_list('pk', flat=True))
+        user_ids = list(User.objects.filter(follower__isnull=True)
+                        .order_by('pk').values_list('pk', flat=True))
+        rng.shuffle(popular)
+        weights = zipf_weights(len(popular), AUTHOR_SKEW)
+
+        def generate():
+            for user_id in user_ids:
+                size = min(pareto_size(rng, per_user), len(popular) - 1)
+                authors = set()
+                for _ in range(size * 3):
+                    if len(authors) >= size:
+                        break
+                    author = rng.choices(popular, cum_weights=weights)[0]
+                    if author != user_id:
+                        authors.add(author)
+                for author in sorted(authors):
+                    yield Follow(user_id=user_id, author_id=author)
+
+        return self.insert(Follow, generate(), '≈{}'.format(
+            per_user * len(user_ids)
+        ))
+
+    def comments(self, count):
+        """Около count комментариев обсуждениями-всплесками.
+
+        У большинства постов обсуждения нет или оно короткое, у немногих
+        — длинное (Парето); внутри обсуждения интервалы между
+        комментариями короткие, изредка с долгими паузами.
+        """
+        rng = self.rng
+        posts = Post.objects.count()
+        if not posts or not count:
+            return 0
+        mean = count / posts
+        author_ids = list(User.objects.values_list('pk', flat=True))
+
+        def threads():
+            last_pk = 0
+            while True:
+                chunk = list(
+                    Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                    .values_list('pk', 'pub_date')[:self.batch_size]
+                )
+                if not chunk:
+                    return
+                last_pk = chunk[-1][0]
+                for post_id, pub_date in chunk:
+                    size = pareto_size(rng, mean)
+                    created = pub_date
+                    for _ in range(min(size, MAX_THREAD)):
+                        pause = (rng.expovariate(1 / 60)
+                                 if rng.random() < 0.9
+                                 else rng.expovariate(1 / 86400))
+                        created += timedelta(seconds=pause)
+                        yield Comment(
+                            text=self.text(1, 3), post_id=post_id,
+                            author_id=rng.choice(author_ids),
+                            created=min(created, self.now),
+                        )
+
+        with no_auto_now(Comment, 'created'):
+            return self.insert(Comment, threads(), f'≈{count}')
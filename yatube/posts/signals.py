@@ -0,0 +1,231 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.urls import reverse
+
+from core.surrogate import purge
+
+from .archive import is_archiving
+from .cache import (FEEDS, GROUPS, INDEX_FEED, bump_version, feed_key,
+                    post_key)
+from .changes import log_change
+from .models import ArchivedPost, Change, Comment, Follow, Group, Post, User
+from .month_archive import affected_pages, clear_pages
+from .prerender import author_pages, group_pages, post_pages, schedule
+
+# Поля групп и пользователей, которые видны на страницах и в лентах.
+DISPLAYED_FIELDS = {
+    Group: ('title', 'slug', 'description'),
+    User: ('username', 'first_name', 'last_name'),
+}
+
+
+def displayed_changed(instance):
+    return getattr(instance, '_displayed_before', None) is not None
+
+
+@receiver(pre_save, sender=Group)
+@receiver(pre_save, sender=User)
+def remember_displayed_fields(sender, instance, update_fields=None,
+                              **kwargs):
+    # Прежние значения, только если сохранение их меняет: смена пароля
+    # или вход не трогают страниц. Обработчики ниже смотрят
+    # displayed_changed().
+    instance._displayed_before = None
+    fields = [field for field in DISPLAYED_FIELDS[sender]
+              if update_fields is None or field in update_fields]
+    if not instance.pk or not fields:
+        return
+    before = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if before and any(before[field] != getattr(instance, field)
+                      for field in fields):
+        instance._displayed_before = before
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_groups(sender, **kwargs):
+    bump_version(GROUPS)
+    bump_version(FEEDS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_feeds(sender, instance, signal, **kwargs):
+    # В лентах имена авторов; регистрация и смена пароля их не меняют.
+    if signal is post_delete or displayed_changed(instance):
+        bump_version(FEEDS)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    cache.delete(post_key(instance.pk))
+    bump_version(FEEDS)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post(sender, instance, **kwargs):
+    cache.delete(post_key(instance.post_id))
+
+
+@receiver(post_save, sender=Post)
+def log_post_saved(sender, instance, created, **kwargs):
+    log_change(Change.POST, instance, created=created)
+
+
+@receiver(post_delete, sender=Post)
+def log_post_deleted(sender, instance, **kwargs):
+    if not is_archiving():
+        log_change(Change.POST, instance)
+
+
+@receiver(post_save, sender=Comment)
+def log_comment_saved(sender, instance, created, **kwargs):
+    log_change(Change.COMMENT, instance, instance.post_id, created)
+
+
+@receiver(post_delete, sender=Comment)
+def log_comment_deleted(sender, instance, **kwargs):
+    if not is_archiving():
+        log_change(Change.COMMENT, instance, instance.post_id)
+
+
+@receiver(post_save, sender=Follow)
+def log_follow_saved(sender, instance, created, **kwargs):
+    log_change(Change.FOLLOW, instance, instance.user_id, created)
+
+
+@receiver(post_delete, sender=Follow)
+def log_follow_deleted(sender, instance, **kwargs):
+    log_change(Change.FOLLOW, instance, instance.user_id)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    # Пост могли перенести в другую группу: старую тоже перерисовать.
+    if settings.PRERENDER['ENABLED'] and instance.pk:
+        instance._previous_group_slug = (
+            Group.objects.filter(posts=instance.pk)
+            .values_list('slug', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def prerender_post(sender, instance, **kwargs):
+    if settings.PRERENDER['ENABLED'] and not is_archiving():
+        schedule(*post_pages(
+            instance, getattr(instance, '_previous_group_slug', None)
+        ))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def prerender_commented_post(sender, instance, **kwargs):
+    if settings.PRERENDER['ENABLED'] and not is_archiving():
+        schedule(reverse('posts:post_detail', args=[instance.post_id]))
+
+
+@receiver(pre_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def remember_group_pages(sender, instance, signal, **kwargs):
+    # Страницы по старому адресу: после смены slug файл ленты по нему
+    # удалится (render_page получит 404), остальные перерисуются.
+    instance._previous_pages = None
+    if (settings.PRERENDER['ENABLED'] and instance.pk
+            and (signal is pre_delete or displayed_changed(instance))):
+        slug = (Group.objects.filter(pk=instance.pk)
+                .values_list('slug', flat=True).first())
+        if slug:
+            instance._previous_pages = group_pages(instance.pk, slug)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def prerender_group(sender, instance, **kwargs):
+    # Ленту новой группы без файла отдаст Django.
+    if settings.PRERENDER['ENABLED'] and instance._previous_pages:
+        schedule(*instance._previous_pages,
+                 reverse('posts:group_list', args=[instance.slug]))
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_delete, sender=User)
+def remember_author_pages(sender, instance, signal, **kwargs):
+    # Регистрация, вход и смена пароля страниц не меняют.
+    instance._previous_pages = None
+    if (settings.PRERENDER['ENABLED'] and instance.pk
+            and (signal is pre_delete or displayed_changed(instance))):
+        username = (User.objects.filter(pk=instance.pk)
+                    .values_list('username', flat=True).first())
+        if username:
+            instance._previous_pages = author_pages(instance.pk, username)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def prerender_profile(sender, instance, **kwargs):
+    if settings.PRERENDER['ENABLED'] and instance._previous_pages:
+        schedule(*instance._previous_pages,
+                 reverse('posts:profile', args=[instance.username]))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post(sender, instance, **kwargs):
+    # Ключ поста снимает его со всех страниц, где он был, в том числе
+    # из прежней группы; ключи лент — чтобы новый пост там появился.
+    if is_archiving():
+        return
+    keys = [f'post-{instance.pk}', INDEX_FEED,
+            feed_key('author', instance.author_id)]
+    if instance.group_id:
+        keys.append(feed_key('group', instance.group_id))
+    purge(*keys)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_commented_post(sender, instance, **kwargs):
+    if not is_archiving():
+        purge(f'post-{instance.post_id}')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def purge_group(sender, instance, **kwargs):
+    purge(f'group-{instance.pk}')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def purge_author(sender, instance, update_fields=None, **kwargs):
+    if update_fields != frozenset({'last_login'}):
+        purge(f'author-{instance.pk}')
+
+
+@receiver(pre_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+@receiver(pre_save, sender=User)
+@receiver(pre_delete, sender=User)
+def remember_month_pages(sender, instance, signal, **kwargs):
+    # Страницы месяцев ищутся до изменения: по старым slug и username.
+    instance._month_pages = None
+    if instance.pk and (signal is pre_delete or displayed_changed(instance)):
+        lookup = 'group' if sender is Group else 'author'
+        instance._month_pages = affected_pages(
+            ArchivedPost.objects.filter(**{lookup: instance.pk})
+        )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_month_pages(sender, instance, **kwargs):
+    if getattr(instance, '_month_pages', None):
+        clear_pages.delay(instance._month_pages)
@@ -0,0 +1,80 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+from posts.paginators import EstimatedCountPaginator
+
+POSTS_CHANGELIST = reverse('admin:posts_post_changelist')
+
+
+class ScalableAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=cls.author, group=cls.group)
+            for i in range(150)
+        )
+        cls.post = Post.objects.first()
+        Comment.objects.create(text='Комментарий', author=cls.author,
+                               post=cls.post)
+        Follow.objects.create(user=cls.admin, author=cls.author)
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        '''Число запросов страницы не зависит от количества постов.'''
+        # Первый запрос кладёт сессию и пользователя в кеш.
+        self.changelist_queries(POSTS_CHANGELIST)
+        before = self.changelist_queries(POSTS_CHANGELIST)
+        Post.objects.bulk_create(
+            Post(text='Ещё пост', author=self.admin, group=self.group)
+            for _ in range(50)
+        )
+        self.assertEqual(self.changelist_queries(POSTS_CHANGELIST), before)
+
+    def test_keyset_next_page(self):
+        '''Следующая страница выбирается по курсору ?after=<pk>.'''
+        response = self.admin_client.get(POSTS_CHANGELIST)
+        cl = response.context['cl']
+        self.assertIsNotNone(cl.next_cursor)
+        response = self.admin_client.get(
+            POSTS_CHANGELIST + cl.next_page_url()
+        )
+        next_page = response.context['cl'].result_list
+        self.assertTrue(all(post.pk < cl.next_cursor for post in next_page))
+
+    def test_comment_and_follow_changelists(self):
+        for model in ('comment', 'follow'):
+            with self.subTest(model=model):
+                response = self.admin_client.get(
+                    reverse(f'admin:posts_{model}_changelist')
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_estimated_count(self):
+        paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+        self.assertGreaterEqual(paginator.count, Post.objects.count())
+        filtered = Post.objects.filter(author=self.author)
+        with self.settings(ESTIMATED_COUNT_LIMIT=100):
+            paginator = EstimatedCountPaginator(filtered, 10)
+            self.assertEqual(paginator.count, 100)
@@ -0,0 +1,109 @@
+import io
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.surrogate import LocMemPurgeBackend
+from posts.archive import archive_posts
+from posts.models import (ArchivedComment, ArchivedPost, Change, Comment,
+                          Group, Post, User)
+from posts.tests.test_surrogate_keys import SURROGATE_ON
+from posts.utils import no_auto_now
+
+BUDGETS_ENFORCED = {'ENABLED': True, 'RAISE': True, 'IGNORE': []}
+
+
+@override_settings(QUERY_BUDGET=BUDGETS_ENFORCED, NUM_POSTS=10)
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+        now = timezone.now()
+        with no_auto_now(Post, 'pub_date'):
+            Post.objects.bulk_create(
+                Post(text=f'Старый пост {i}', author=cls.author,
+                     group=cls.group,
+                     pub_date=now - timedelta(days=400 + i))
+                for i in range(7)
+            )
+            Post.objects.bulk_create(
+                Post(text=f'Новый пост {i}', author=cls.author,
+                     group=cls.group, pub_date=now - timedelta(days=i))
+                for i in range(8)
+            )
+        cls.old_post = Post.objects.get(text='Старый пост 0')
+        Comment.objects.create(text='Старый комментарий',
+                               author=cls.author, post=cls.old_post)
+        call_command('archive_posts', age_days=365, batch_size=3,
+                     stdout=io.StringIO())
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def test_old_posts_moved_with_comments(self):
+        '''Старые посты и их комментарии переносятся в архив.'''
+        self.assertEqual(Post.objects.count(), 8)
+        self.assertEqual(ArchivedPost.objects.count(), 7)
+        self.assertFalse(Comment.objects.exists())
+        comment = ArchivedComment.objects.get()
+        self.assertEqual(comment.post_id, self.old_post.pk)
+
+    def test_detail_falls_back_to_archive(self):
+        '''Архивный пост открывается по прежнему адресу, без формы.'''
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.old_post.pk])
+        )
+        self.assertContains(response, 'Старый пост 0')
+        self.assertContains(response, 'Старый комментарий')
+        self.assertNotContains(response, 'Добавить комментарий')
+
+    def test_profile_pages_continue_into_archive(self):
+        '''Профиль показывает горячие посты, затем архивные.'''
+        url = reverse('posts:profile', args=['auth'])
+        first = self.client.get(url).context['page_obj']
+        second = self.client.get(url, {'page': 2}).context['page_obj']
+        self.assertEqual(first.paginator.count, 15)
+        self.assertEqual(
+            [post.text for post in first][-3:],
+            ['Новый пост 7', 'Старый пост 0', 'Старый пост 1']
+        )
+        self.assertEqual(len(second), 5)
+        self.assertEqual(second[-1].text, 'Старый пост 6')
+
+    def test_feeds_stay_on_hot_table(self):
+        '''Главная и лента группы архив не показывают.'''
+        for url in (reverse('posts:index'),
+                    reverse('posts:group_list', args=['test-slug'])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.context['page_obj'].paginator.count,
+                                 8)
+
+    def test_archiving_is_not_deletion(self):
+        '''Перенос в архив не пишется в журнал как удаление.'''
+        self.assertFalse(
+            Change.objects.filter(action=Change.DELETED).exists()
+        )
+
+    @override_settings(SURROGATE_KEYS=SURROGATE_ON,
+                       TASKS={'EAGER': True, 'DIR': None})
+    def test_archived_batch_purged_once(self):
+        '''Пачка сбрасывает в прокси только ключи перенесённых постов.'''
+        with no_auto_now(Post, 'pub_date'):
+            post = Post.objects.create(
+                text='Ещё старый', author=self.author, group=self.group,
+                pub_date=timezone.now() - timedelta(days=500)
+            )
+        Comment.objects.create(text='Комментарий', author=self.author,
+                               post=post)
+        LocMemPurgeBackend.purged.clear()
+        archive_posts(365, 10)
+        self.assertEqual(LocMemPurgeBackend.purged, [f'post-{post.pk}'])
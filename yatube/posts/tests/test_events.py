@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from posts.events import ChangeBroker, broker
+from posts.models import Change, Comment, Post, User
+
+
+class ChangeLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+
+    def test_saves_are_logged(self):
+        post = Post.objects.create(author=self.author, text='Пост')
+        post.text = 'Исправленный пост'
+        post.save()
+        comment = Comment.objects.create(author=self.author, post=post,
+                                         text='Комментарий')
+        self.assertEqual(
+            list(Change.objects.values_list(
+                'model', 'action', 'object_id', 'parent_id'
+            )),
+            [
+                (Change.POST, Change.CREATED, post.id, None),
+                (Change.POST, Change.UPDATED, post.id, None),
+                (Change.COMMENT, Change.CREATED, comment.id, post.id),
+            ]
+        )
+
+
+@mock.patch.object(ChangeBroker, 'start')
+class EventStreamTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+
+    def setUp(self):
+        cache.clear()
+        broker.last_seq = None
+        self.guest_client = Client()
+
+    def tearDown(self):
+        broker.subscribers.clear()
+
+    def open_stream(self, **params):
+        response = self.guest_client.get(reverse('posts:events'), params)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertTrue(next(stream).startswith(b'retry:'))
+        broker.poll_once()
+        return stream
+
+    def test_new_posts_event(self, start):
+        stream = self.open_stream()
+        Post.objects.create(author=self.author, text='Новый пост')
+        Post.objects.create(author=self.author, text='Ещё пост')
+        with self.assertNumQueries(1):
+            broker.poll_once()
+        self.assertIn(b'"count": 1', next(stream))
+        self.assertIn(b'"count": 2', next(stream))
+
+    def test_new_comment_event(self, start):
+        stream = self.open_stream(post=self.post.id)
+        comment = Comment.objects.create(author=self.author, post=self.post,
+                                         text='Комментарий')
+        broker.poll_once()
+        chunk = next(stream)
+        self.assertIn(b'event: comment', chunk)
+        self.assertIn(f'"id": {comment.id}'.encode(), chunk)
+
+    def test_subscribers_share_one_poll(self, start):
+        streams = [self.open_stream() for _ in range(3)]
+        Post.objects.create(author=self.author, text='Новый пост')
+        with self.assertNumQueries(1):
+            broker.poll_once()
+        for stream in streams:
+            self.assertIn(b'event: posts', next(stream))
+
+
+@override_settings(EVENTS_POLL_INTERVAL=0.01)
+@mock.patch.object(ChangeBroker, 'poll_once')
+class ChangeBrokerThreadTests(SimpleTestCase):
+    def test_thread_restarts_for_new_subscriber(self, poll_once):
+        '''Поток выходит без подписчиков и запускается для нового.'''
+        changes = ChangeBroker()
+        for _ in range(2):
+            subscriber = changes.subscribe()
+            thread = changes.thread
+            self.assertTrue(thread.is_alive())
+            changes.unsubscribe(subscriber)
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+            self.assertIsNone(changes.thread)
+
+    def test_restart_starts_from_log_head(self, poll_once):
+        '''После остановки поток не пересказывает старые изменения.'''
+        changes = ChangeBroker()
+        subscriber = changes.subscribe()
+        thread = changes.thread
+        changes.last_seq = 42
+        changes.unsubscribe(subscriber)
+        thread.join(timeout=5)
+        self.assertIsNone(changes.last_seq)
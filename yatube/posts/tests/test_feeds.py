@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+class FeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, text='Тестовый пост', group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def feed_urls(self):
+        return (
+            reverse('posts:index_rss'),
+            reverse('posts:index_atom'),
+            reverse('posts:group_rss', kwargs={'slug': self.group.slug}),
+            reverse('posts:group_atom', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile_rss', kwargs={'username': self.author}),
+            reverse('posts:profile_atom', kwargs={'username': self.author}),
+        )
+
+    def test_feeds_contain_post(self):
+        for url in self.feed_urls():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, self.post.text)
+
+    def test_conditional_get_without_queries(self):
+        '''Повторный опрос с If-None-Match не обращается к базе.'''
+        for url in self.feed_urls():
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag
+                    )
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+
+    def test_new_post_changes_feed(self):
+        url = reverse('posts:index_rss')
+        etag = self.guest_client.get(url)['ETag']
+        Post.objects.create(author=self.author, text='Новый пост')
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Новый пост')
+
+    def test_evicted_snapshot_changes_etag(self):
+        '''После сброса кеша ETag старой ленты не даёт ложный 304.'''
+        url = reverse('posts:index_rss')
+        etag = self.guest_client.get(url)['ETag']
+        Post.objects.create(author=self.author, text='Новый пост')
+        cache.clear()
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Новый пост')
+
+    def test_author_rename_changes_feed(self):
+        url = reverse('posts:index_rss')
+        self.guest_client.get(url)
+        self.author.first_name = 'Лев'
+        self.author.last_name = 'Толстой'
+        self.author.save()
+        self.assertContains(self.guest_client.get(url), 'Лев Толстой')
+
+    def test_invisible_user_changes_keep_etag(self):
+        '''Регистрация и смена пароля не сбрасывают ETag лент.'''
+        url = reverse('posts:index_rss')
+        etag = self.guest_client.get(url)['ETag']
+        User.objects.create_user(username='newcomer')
+        author = User.objects.get(pk=self.author.pk)
+        author.set_password('new-password')
+        author.save()
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_unknown_group_feed(self):
+        response = self.guest_client.get(
+            reverse('posts:group_rss', kwargs={'slug': 'missing'})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
@@ -9,8 +9,10 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
+from ..comment_buffer import comment_queue, flush_comments, to_comment
 from ..forms import PostForm
-from ..models import Group, Post, User
+from ..models import Comment, Group, Post, User
+from ..utils import no_auto_now
 
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
@@ -252,3 +254,73 @@ class CommentsTests(TestCase):
         comments_before_after_guest_client = post.comments.all().count()
         self.assertEqual(comments_before_guest_client,
                          comments_before_after_guest_client)
+
+
+@override_settings(COMMENT_WRITE_BEHIND=True)
+class CommentWriteBehindTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='auth')
+        cls.reader = User.objects.create(username='reader')
+        cls.post = Post.objects.create(author=cls.author, text='Текст')
+
+    def setUp(self):
+        cache.clear()
+        self.queue_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            COMMENT_QUEUE_DIR=self.queue_dir
+        )
+        self.settings_override.enable()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.queue_dir, ignore_errors=True)
+
+    def add_comment(self, text):
+        self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
+            data={'text': text}
+        )
+
+    def test_comment_is_queued_and_flushed(self):
+        self.add_comment('Отложенный комментарий')
+        self.assertFalse(self.post.comments.exists())
+        self.assertEqual(flush_comments(), 1)
+        comment = self.post.comments.get()
+        self.assertEqual(comment.text, 'Отложенный комментарий')
+        self.assertEqual(comment.author, self.reader)
+        self.assertEqual(flush_comments(), 0)
+
+    def test_author_sees_own_pending_comment(self):
+        '''Свой комментарий виден до записи в базу, чужой — нет.'''
+        self.add_comment('Отложенный комментарий')
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        self.assertContains(self.reader_client.get(url),
+                            'Отложенный комментарий')
+        self.assertNotContains(self.author_client.get(url),
+                               'Отложенный комментарий')
+
+    def test_flushed_comment_not_shown_twice(self):
+        '''Записанный, но не подтверждённый комментарий виден один раз.'''
+        self.add_comment('Отложенный комментарий')
+        items, _ = comment_queue().take()
+        with no_auto_now(Comment, 'created'):
+            to_comment(items[0]).save()
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        self.assertContains(self.reader_client.get(url),
+                            'Отложенный комментарий', count=1)
+
+    def test_resumed_flush_skips_saved_comments(self):
+        self.add_comment('Первый')
+        self.add_comment('Второй')
+        queue = comment_queue()
+        items, _ = queue.take()
+        with no_auto_now(Comment, 'created'):
+            to_comment(items[0]).save()
+        self.assertEqual(flush_comments(), 1)
+        self.assertEqual(self.post.comments.count(), 2)
@@ -0,0 +1,157 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Group, Post, User
+from posts.tests.test_surrogate_keys import SURROGATE_ON
+from posts.utils import no_auto_now
+
+TEMP_PAGES_DIR = tempfile.mkdtemp()
+BUDGETS_ENFORCED = {'ENABLED': True, 'RAISE': True, 'IGNORE': []}
+
+
+@override_settings(ARCHIVE_PAGES_DIR=TEMP_PAGES_DIR,
+                   QUERY_BUDGET=BUDGETS_ENFORCED,
+                   TASKS={'EAGER': True, 'DIR': None})
+class MonthArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+        cls.year = timezone.localdate().year - 3
+        with no_auto_now(Post, 'pub_date'):
+            Post.objects.create(
+                text='Старый пост', author=cls.author, group=cls.group,
+                pub_date=timezone.make_aware(datetime(cls.year, 5, 10))
+            )
+        Post.objects.create(text='Новый пост', author=cls.author,
+                            group=cls.group)
+        call_command('archive_posts', stdout=io.StringIO())
+        cls.urls = (
+            reverse('posts:archive_month', args=[cls.year, 5]),
+            reverse('posts:group_archive', args=['test-slug', cls.year, 5]),
+            reverse('posts:profile_archive', args=['auth', cls.year, 5]),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PAGES_DIR, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(TEMP_PAGES_DIR, ignore_errors=True)
+
+    def test_complete_month_served_from_disk(self):
+        '''Завершённый месяц рисуется один раз и отдаётся без базы.'''
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Старый пост')
+                self.assertNotContains(response, 'Новый пост')
+                self.assertIn('public', response['Cache-Control'])
+                with self.assertNumQueries(0):
+                    cached = self.client.get(url)
+                self.assertEqual(cached.content, response.content)
+                self.assertIn('public', cached['Cache-Control'])
+
+    def test_current_month_is_not_cached(self):
+        '''Текущий месяц рисуется на каждый запрос.'''
+        today = timezone.localdate()
+        response = self.client.get(
+            reverse('posts:archive_month', args=[today.year, today.month])
+        )
+        self.assertContains(response, 'Новый пост')
+        self.assertFalse(response.has_header('Cache-Control'))
+
+    def test_logged_in_users_get_personal_page(self):
+        '''Вошедшему пользователю страница с диска не отдаётся.'''
+        self.client.get(self.urls[0])
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(self.urls[0])
+        self.assertContains(response, 'Пользователь: auth')
+        self.assertFalse(response.has_header('Cache-Control'))
+
+    def test_unknown_month_and_group(self):
+        '''Несуществующий месяц или группа — 404, на диск не пишется.'''
+        for url in (reverse('posts:archive_month', args=[self.year, 13]),
+                    reverse('posts:archive_month', args=[9999, 12]),
+                    reverse('posts:group_archive',
+                            args=['missing', self.year, 5])):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertFalse(os.path.exists(TEMP_PAGES_DIR))
+
+    def test_empty_month_not_saved(self):
+        '''Пустой завершённый месяц не пишется на диск.'''
+        response = self.client.get(
+            reverse('posts:archive_month', args=[1500, 3])
+        )
+        self.assertContains(response, 'В этом месяце записей нет')
+        self.assertFalse(response.has_header('Cache-Control'))
+        self.assertFalse(os.path.exists(TEMP_PAGES_DIR))
+
+    def saved_pages(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), TEMP_PAGES_DIR)
+            for directory, _, names in os.walk(TEMP_PAGES_DIR)
+            for name in names
+        )
+
+    def test_displayed_changes_clear_pages(self):
+        '''Смена названия группы или имени автора удаляет его месяцы.'''
+        def rename_group():
+            group = Group.objects.get(pk=self.group.pk)
+            group.title = 'Новое название'
+            group.save()
+
+        def rename_author():
+            author = User.objects.get(pk=self.author.pk)
+            author.first_name = 'Лев'
+            author.save()
+
+        for change in (rename_group, rename_author):
+            with self.subTest(change=change.__name__):
+                for url in self.urls:
+                    self.client.get(url)
+                self.assertEqual(len(self.saved_pages()), 3)
+                change()
+                self.assertEqual(self.saved_pages(), [])
+
+    def test_other_changes_keep_pages(self):
+        '''Смена пароля, сохранение без правок и новые записи — нет.'''
+        for url in self.urls:
+            self.client.get(url)
+        saved = self.saved_pages()
+        author = User.objects.get(pk=self.author.pk)
+        author.set_password('new-password')
+        author.save()
+        Group.objects.get(pk=self.group.pk).save()
+        Group.objects.create(title='Другая', slug='other')
+        User.objects.create_user(username='newcomer')
+        self.assertEqual(self.saved_pages(), saved)
+
+    def test_deleted_group_clears_pages(self):
+        '''Удаление группы убирает страницы, где были её ссылки.'''
+        for url in self.urls:
+            self.client.get(url)
+        Group.objects.get(pk=self.group.pk).delete()
+        self.assertEqual(self.saved_pages(), [])
+
+    @override_settings(SURROGATE_KEYS=SURROGATE_ON)
+    def test_disk_pages_keep_surrogate_keys(self):
+        '''Страница с диска несёт те же ключи, что и отрисованная.'''
+        for url in self.urls:
+            with self.subTest(url=url):
+                rendered = self.client.get(url)['Surrogate-Key']
+                self.assertIn(f'group-{self.group.pk}', rendered)
+                self.assertEqual(self.client.get(url)['Surrogate-Key'],
+                                 rendered)
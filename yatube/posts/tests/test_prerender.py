@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from posts import prerender
+from posts.archive import archive_posts
+from posts.models import Comment, Group, Post, User
+from posts.prerender import file_path, render_page
+from posts.utils import no_auto_now
+
+TEMP_PRERENDER_DIR = tempfile.mkdtemp()
+
+
+@override_settings(
+    PRERENDER={'ENABLED': True, 'DIR': TEMP_PRERENDER_DIR,
+               'HOST': 'testserver'},
+    TASKS={'EAGER': True, 'DIR': TEMP_PRERENDER_DIR},
+)
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PRERENDER_DIR, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def read(self, path):
+        with open(file_path(path), encoding='utf-8') as file:
+            return file.read()
+
+    def test_post_change_renders_affected_pages(self):
+        '''Новый пост попадает в файлы главной, группы, профиля и поста.'''
+        post = Post.objects.create(text='Первый пост', author=self.author,
+                                   group=self.group)
+        for path in ('/', '/group/test-slug/', '/profile/auth/',
+                     f'/posts/{post.pk}/'):
+            with self.subTest(path=path):
+                self.assertIn('Первый пост', self.read(path))
+
+    def test_index_is_not_taken_from_page_cache(self):
+        '''Второй пост подряд виден в файле главной сразу.'''
+        Post.objects.create(text='Первый пост', author=self.author)
+        Post.objects.create(text='Второй пост', author=self.author)
+        self.assertIn('Второй пост', self.read('/'))
+
+    def test_comment_and_delete(self):
+        '''Комментарий перерисовывает пост, удаление убирает файл.'''
+        post = Post.objects.create(text='Пост', author=self.author)
+        path = f'/posts/{post.pk}/'
+        Comment.objects.create(text='Комментарий', author=self.author,
+                               post=post)
+        self.assertIn('Комментарий', self.read(path))
+        post.delete()
+        self.assertFalse(os.path.exists(file_path(path)))
+        self.assertNotIn('>Пост<', self.read('/'))
+
+    def test_moved_post_leaves_old_group(self):
+        '''Пост, перенесённый в другую группу, пропадает из старой.'''
+        post = Post.objects.create(text='Кочующий пост', author=self.author,
+                                   group=self.group)
+        post.group = Group.objects.create(title='Другая', slug='other')
+        post.save()
+        self.assertNotIn('Кочующий пост', self.read('/group/test-slug/'))
+        self.assertIn('Кочующий пост', self.read('/group/other/'))
+
+    def test_renamed_group_and_author_leave_old_paths(self):
+        '''После смены slug и username файлы по старым адресам удалены.'''
+        post = Post.objects.create(text='Пост', author=self.author,
+                                   group=self.group)
+        self.group.slug = 'new-slug'
+        self.group.save()
+        self.assertFalse(os.path.exists(file_path('/group/test-slug/')))
+        self.assertIn('>Пост<', self.read('/group/new-slug/'))
+        self.author.username = 'renamed'
+        self.author.save()
+        self.assertFalse(os.path.exists(file_path('/profile/auth/')))
+        self.assertIn('/profile/renamed/', self.read('/'))
+        self.assertIn('/profile/renamed/', self.read(f'/posts/{post.pk}/'))
+
+    def test_archived_post_leaves_group_page(self):
+        '''Перенос в архив убирает пост из файла ленты группы.'''
+        with no_auto_now(Post, 'pub_date'):
+            post = Post.objects.create(
+                text='Старый пост', author=self.author, group=self.group,
+                pub_date=timezone.now() - timedelta(days=500)
+            )
+        archive_posts(365, 10)
+        self.assertNotIn('Старый пост', self.read('/group/test-slug/'))
+        self.assertIn('Старый пост', self.read(f'/posts/{post.pk}/'))
+
+    def test_invisible_changes_render_nothing(self):
+        '''Регистрация и смена пароля страниц не перерисовывают.'''
+        Post.objects.create(text='Пост', author=self.author, group=self.group)
+        with mock.patch.object(render_page, 'delay') as delay:
+            User.objects.create_user(username='newcomer')
+            author = User.objects.get(pk=self.author.pk)
+            author.set_password('new-password')
+            author.save()
+            Group.objects.get(pk=self.group.pk).save()
+        delay.assert_not_called()
+
+    def test_deleted_group_leaves_posts(self):
+        '''Удалённая группа пропадает с диска и из страниц её постов.'''
+        group = Group.objects.create(title='Временная', slug='temporary')
+        post = Post.objects.create(text='Пост', author=self.author,
+                                   group=group)
+        group.delete()
+        self.assertFalse(os.path.exists(file_path('/group/temporary/')))
+        self.assertNotIn('/group/temporary/', self.read('/profile/auth/'))
+        self.assertTrue(os.path.exists(file_path(f'/posts/{post.pk}/')))
+
+
+@override_settings(
+    PRERENDER={'ENABLED': True, 'DIR': TEMP_PRERENDER_DIR,
+               'HOST': 'testserver'},
+    TASKS={'EAGER': True, 'DIR': TEMP_PRERENDER_DIR},
+    REPLICA_ROUTING={'ENABLED': True, 'REPLICAS': ['replica'],
+                     'PIN_SECONDS': 5, 'PIN_COOKIE': 'pin_primary'},
+)
+class PrerenderReplicaTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def test_pages_read_from_primary(self):
+        '''Страницы рисуются с primary: реплика могла не догнать запись.'''
+        author = User.objects.create_user(username='auth')
+        # Обработчик собирает middleware при создании — нужен новый.
+        with mock.patch.object(prerender, '_handler', None), \
+                CaptureQueriesContext(connections['replica']) as replica:
+            Post.objects.create(text='Свежий пост', author=author)
+        self.assertEqual(len(replica), 0)
+        with open(file_path('/'), encoding='utf-8') as file:
+            self.assertIn('Свежий пост', file.read())
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+
+from posts.models import Group, Post, User
+from posts.seeding import Seeder
+
+BUDGETS_ENFORCED = {'ENABLED': True, 'RAISE': True, 'IGNORE': []}
+
+
+def posts_views():
+    for pattern in get_resolver().url_patterns:
+        if (isinstance(pattern, URLResolver)
+                and pattern.namespace == 'posts'):
+            for view in pattern.url_patterns:
+                if view.callback.__module__ == 'posts.views':
+                    yield view.name, view.callback
+
+
+@override_settings(QUERY_BUDGET=BUDGETS_ENFORCED)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        seeder = Seeder(batch_size=500)
+        seeder.users(20)
+        seeder.groups(3)
+        seeder.posts(300, image_fraction=0)
+        seeder.follows(10)
+        seeder.comments(600)
+        cls.user = User.objects.filter(follower__isnull=False).first()
+        cls.post = Post.objects.filter(comments__isnull=False).first()
+        cls.own_post = Post.objects.filter(author=cls.user).first()
+        cls.group = Group.objects.first()
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_every_view_has_budget(self):
+        for name, view in posts_views():
+            with self.subTest(view=name):
+                self.assertTrue(hasattr(view, 'query_budget'))
+
+    def test_views_stay_within_budget(self):
+        author = self.post.author.username
+        requests = [
+            ('get', reverse('posts:index'), {}),
+            ('get', reverse('posts:group_list', args=[self.group.slug]), {}),
+            ('get', reverse('posts:profile', args=[author]), {}),
+            ('get', reverse('posts:profile', args=[author]), {'page': 2}),
+            ('get', reverse('posts:post_detail', args=[self.post.pk]), {}),
+            ('get', reverse('posts:post_comments', args=[self.post.pk]), {}),
+            ('post', reverse('posts:add_comment', args=[self.post.pk]),
+             {'text': 'Комментарий'}),
+            ('get', reverse('posts:post_create'), {}),
+            ('post', reverse('posts:post_create'),
+             {'text': 'Новый пост', 'group': self.group.pk}),
+            ('get', reverse('posts:post_edit', args=[self.own_post.pk]), {}),
+            ('post', reverse('posts:post_edit', args=[self.own_post.pk]),
+             {'text': 'Изменённый пост', 'group': self.group.pk}),
+            ('get', reverse('posts:group_autocomplete'), {'q': 'Груп'}),
+            ('get', reverse('posts:follow_index'), {}),
+            ('get', reverse('posts:profile_unfollow', args=[author]), {}),
+            ('get', reverse('posts:profile_follow', args=[author]), {}),
+        ]
+        for method, url, data in requests:
+            with self.subTest(method=method, url=url, data=data):
+                response = getattr(self.client, method)(url, data)
+                self.assertLess(response.status_code, 400)
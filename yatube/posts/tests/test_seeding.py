@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import TestCase
+
+from posts.models import Comment, Follow, Group, Post, User
+from posts.seeding import Seeder
+
+
+def dataset():
+    return list(
+        Post.objects.order_by('pk')
+        .values_list('author__username', 'group__slug', 'text')
+    )
+
+
+class SeederTests(TestCase):
+    def seed(self, seed):
+        seeder = Seeder(seed, batch_size=50)
+        seeder.users(30)
+        seeder.groups(3)
+        seeder.posts(200, image_fraction=0)
+        seeder.follows(5)
+        seeder.comments(400)
+
+    def test_same_seed_same_data(self):
+        self.seed(7)
+        first = dataset()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        self.seed(7)
+        self.assertEqual(dataset(), first)
+
+    def test_distributions(self):
+        self.seed(1)
+        self.assertEqual(Post.objects.count(), 200)
+        dates = list(Post.objects.order_by('pk')
+                     .values_list('pub_date', flat=True))
+        self.assertEqual(dates, sorted(dates))
+        self.assertFalse(
+            Follow.objects.filter(user=F('author')).exists()
+        )
+        self.assertGreater(Comment.objects.count(), 200)
+        posts_with_comments = (Comment.objects.values('post')
+                               .distinct().count())
+        self.assertLess(posts_with_comments, 200)
+
+    def test_command_refuses_non_empty_database(self):
+        call_command('seed', users=5, groups=1, posts=10, comments=10,
+                     follows=2, images=0, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 10)
+        with self.assertRaises(CommandError):
+            call_command('seed', posts=10, stdout=StringIO())
+
+    def test_command_adds_to_seeded_database(self):
+        '''Повторный seed --force не повторяет имена и slug.'''
+        for _ in range(2):
+            call_command('seed', users=5, groups=2, posts=10, comments=10,
+                         follows=2, images=0, force=True, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 10)
+        self.assertEqual(Group.objects.count(), 4)
+        self.assertEqual(Post.objects.count(), 20)
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.surrogate import LocMemPurgeBackend
+from posts.models import Comment, Group, Post, User
+
+SURROGATE_ON = {
+    'ENABLED': True,
+    'HEADER': 'Surrogate-Key',
+    'MAX_AGE': 3600,
+    'BACKEND': 'core.surrogate.LocMemPurgeBackend',
+    'PURGE_URL': None,
+    'PURGE_METHOD': 'PURGE',
+    'PURGE_HEADER': 'Surrogate-Key',
+    'TIMEOUT': 5,
+}
+
+
+@override_settings(SURROGATE_KEYS=SURROGATE_ON,
+                   TASKS={'EAGER': True, 'DIR': None})
+class SurrogateKeyTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+        cls.post = Post.objects.create(text='Пост', author=cls.author,
+                                       group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        LocMemPurgeBackend.purged.clear()
+
+    def keys(self, url):
+        return set(self.client.get(url)['Surrogate-Key'].split())
+
+    def test_pages_tagged(self):
+        '''Страницы помечены ключами постов, авторов, групп и лент.'''
+        post_keys = {f'post-{self.post.pk}', f'author-{self.author.pk}',
+                     f'group-{self.group.pk}'}
+        pages = {
+            reverse('posts:index'): {'feed-index'},
+            reverse('posts:group_list', args=['test-slug']):
+                {f'feed-group-{self.group.pk}'},
+            reverse('posts:profile', args=['auth']):
+                {f'feed-author-{self.author.pk}'},
+            reverse('posts:post_detail', args=[self.post.pk]): set(),
+            reverse('posts:index_rss'): {'feed-index'},
+        }
+        for url, feed_keys in pages.items():
+            with self.subTest(url=url):
+                self.assertTrue(post_keys | feed_keys <= self.keys(url))
+
+    def test_changes_purge_keys(self):
+        '''Изменения моделей сбрасывают ключи в прокси.'''
+        post = Post.objects.create(text='Новый', author=self.author,
+                                   group=self.group)
+        self.assertEqual(set(LocMemPurgeBackend.purged), {
+            f'post-{post.pk}', 'feed-index',
+            f'feed-author-{self.author.pk}', f'feed-group-{self.group.pk}',
+        })
+        for make, key in (
+            (lambda: Comment.objects.create(text='К', author=self.author,
+                                            post=self.post),
+             f'post-{self.post.pk}'),
+            (lambda: self.group.save(), f'group-{self.group.pk}'),
+            (lambda: self.author.save(), f'author-{self.author.pk}'),
+        ):
+            with self.subTest(key=key):
+                LocMemPurgeBackend.purged.clear()
+                make()
+                self.assertIn(key, LocMemPurgeBackend.purged)
+
+    def test_login_does_not_purge(self):
+        '''Вход пользователя (last_login) не сбрасывает его страницы.'''
+        self.author.set_password('pass')
+        self.author.save()
+        LocMemPurgeBackend.purged.clear()
+        self.client.login(username='auth', password='pass')
+        self.assertEqual(LocMemPurgeBackend.purged, [])
+
+    def test_logged_in_pages_not_tagged(self):
+        '''Страницы вошедшего пользователя private и без ключей.'''
+        self.client.force_login(self.author)
+        for url in (reverse('posts:index'),
+                    reverse('posts:profile', args=['auth']),
+                    reverse('posts:post_detail', args=[self.post.pk])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertFalse(response.has_header('Surrogate-Key'))
+                self.assertFalse(response.has_header('Surrogate-Control'))
+                self.assertIn('private', response['Cache-Control'])
@@ -3,10 +3,12 @@ from datetime import date
 from django import forms
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from posts.models import Follow, Group, Post, User
+from posts.models import Comment, Follow, Group, Post, User
 
 SMALL_GIF = (
     b'\x47\x49\x46\x38\x39\x61\x02\x00'
@@ -253,3 +255,114 @@ class FollowTests(TestCase):
                 )
             )
         self.assertEqual(Follow.objects.count(), 0)
+
+
+class GroupAutocompleteTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='auth')
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group-{i}',
+                  description='Описание')
+            for i in range(30)
+        )
+        cls.group = Group.objects.create(
+            title='Котики', slug='cats', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, text='Текст', group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_form_renders_only_selected_group(self):
+        '''В форме редактирования только выбранная группа.'''
+        response = self.authorized_client.get(reverse(
+            'posts:post_edit', kwargs={'post_id': self.post.id})
+        )
+        self.assertContains(response, 'Котики')
+        self.assertNotContains(response, 'Группа 1')
+        self.assertContains(response, 'data-autocomplete-url')
+
+    def test_autocomplete_by_prefix(self):
+        url = reverse('posts:group_autocomplete')
+        response = self.authorized_client.get(url, {'q': 'кот'})
+        self.assertEqual(
+            response.json()['results'],
+            [{'id': self.group.id, 'text': 'Котики'}]
+        )
+        response = self.authorized_client.get(url, {'q': 'group-1'})
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_autocomplete_cache_invalidated(self):
+        url = reverse('posts:group_autocomplete')
+        self.authorized_client.get(url, {'q': 'Соб'})
+        Group.objects.create(title='Собаки', slug='dogs', description='-')
+        response = self.authorized_client.get(url, {'q': 'Соб'})
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_autocomplete_cache_keeps_query_case(self):
+        '''Ответ на запрос в другом регистре не берётся из кеша.'''
+        group = Group.objects.create(title='котята', slug='kittens',
+                                     description='-')
+        url = reverse('posts:group_autocomplete')
+        self.authorized_client.get(url, {'q': 'Кот'})
+        response = self.authorized_client.get(url, {'q': 'кот'})
+        self.assertIn({'id': group.id, 'text': 'котята'},
+                      response.json()['results'])
+
+
+@override_settings(COMMENTS_PER_PAGE=5)
+class CommentPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='auth')
+        cls.post = Post.objects.create(author=cls.author, text='Текст')
+        cls.commenters = [
+            User.objects.create(username=f'user{i}') for i in range(12)
+        ]
+        for i, commenter in enumerate(cls.commenters):
+            Comment.objects.create(post=cls.post, author=commenter,
+                                   text=f'Комментарий {i}')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_first_page_is_bounded(self):
+        '''Число запросов не зависит от количества комментариев.'''
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        with CaptureQueriesContext(connection) as before:
+            self.guest_client.get(url)
+        Comment.objects.create(post=self.post, author=self.author,
+                               text='Ещё комментарий')
+        with CaptureQueriesContext(connection) as after:
+            response = self.guest_client.get(url)
+        self.assertEqual(len(before), len(after))
+        self.assertEqual(len(response.context['comments']), 5)
+
+    def test_load_more_fragment(self):
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        texts = []
+        response = self.guest_client.get(url, {'order': 'newest'})
+        page = response.context['comments']
+        texts += [comment.text for comment in page]
+        while page.has_next():
+            response = self.guest_client.get(
+                reverse('posts:post_comments',
+                        kwargs={'post_id': self.post.id}),
+                {'order': 'newest', 'cursor': page.next_cursor}
+            )
+            self.assertTemplateNotUsed(response, 'base.html')
+            page = response.context['comments']
+            texts += [comment.text for comment in page]
+        self.assertEqual(
+            texts,
+            list(self.post.comments.order_by('-created', '-pk')
+                 .values_list('text', flat=True))
+        )
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'posts'
 
@@ -10,15 +10,49 @@ urlpatterns = [
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('create/', views.post_create, name='post_create'),
+    path('groups/autocomplete/',
+         views.group_autocomplete,
+         name='group_autocomplete'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('posts/<int:post_id>/comments/',
+         views.post_comments,
+         name='post_comments'),
     path('posts/<int:post_id>/comment/',
          views.add_comment,
          name='add_comment'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('events/', views.events, name='events'),
     path('profile/<str:username>/follow/',
          views.profile_follow,
          name='profile_follow'),
     path('profile/<str:username>/unfollow/',
          views.profile_unfollow,
          name='profile_unfollow'),
+    path('archive/<int:year>/<int:month>/',
+         views.archive_month,
+         name='archive_month'),
+    path('group/<slug:slug>/archive/<int:year>/<int:month>/',
+         views.group_archive,
+         name='group_archive'),
+    path('profile/<str:username>/archive/<int:year>/<int:month>/',
+         views.profile_archive,
+         name='profile_archive'),
+    path('feeds/rss/',
+         feeds.LatestPostsFeed().as_view(),
+         name='index_rss'),
+    path('feeds/atom/',
+         feeds.LatestPostsAtomFeed().as_view(),
+         name='index_atom'),
+    path('group/<slug:slug>/rss/',
+         feeds.GroupPostsFeed().as_view(),
+         name='group_rss'),
+    path('group/<slug:slug>/atom/',
+         feeds.GroupPostsAtomFeed().as_view(),
+         name='group_atom'),
+    path('profile/<str:username>/rss/',
+         feeds.AuthorPostsFeed().as_view(),
+         name='profile_rss'),
+    path('profile/<str:username>/atom/',
+         feeds.AuthorPostsAtomFeed().as_view(),
+         name='profile_atom'),
 ]
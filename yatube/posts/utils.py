@@ -1,8 +1,32 @@
+from contextlib import contextmanager
+
 from django.conf import settings
 from django.core.paginator import Paginator
+from django.db.models import Q
 
 
 def split_pages(posts, request):
     paginator = Paginator(posts, settings.NUM_POSTS)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
+
+
+def prefix_range(field, prefix):
+    # Диапазон вместо LIKE: SQLite использует для него индекс поля.
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\uffff'})
+
+
+@contextmanager
+def no_auto_now(model, field_name):
+    """Временно отключает auto_now_add, чтобы сохранить свою дату.
+
+    Меняет поле модели для всего процесса — только для отдельных
+    процессов вроде flush_comments и seed, не для веб-воркеров.
+    """
+    field = model._meta.get_field(field_name)
+    auto_now_add = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = auto_now_add
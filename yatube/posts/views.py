@@ -1,23 +1,48 @@
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.cache import patch_cache_control
 from django.views.decorators.cache import cache_page
 from django.conf import settings
-from django.core.paginator import Paginator
 
+from core.db_router import use_replica
+from core.query_budget import query_budget
+from core.surrogate import tag
+
+from .archive import TieredPosts, get_post_or_404
+from .cache import (GROUPS, INDEX_FEED, INDEX_PAGE, feed_key, page_keys,
+                    surrogate_keys, versioned_key)
+from .comment_buffer import enqueue_comment, pending_comments
+from .events import event_stream
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
-from .utils import split_pages
+from .models import ArchivedPost, Follow, Group, Post, User
+from .month_archive import (is_complete, month_bounds, neighbours, page_path,
+                            read_page, save_page)
+from .paginators import CursorPaginator, InvalidCursor
+from .utils import prefix_range, split_pages
+
+COMMENT_ORDERINGS = {
+    'oldest': ('created', 'pk'),
+    'newest': ('-created', '-pk'),
+}
 
 
-@cache_page(20, key_prefix='index_page')
+@use_replica
+@cache_page(20, key_prefix=INDEX_PAGE)
+@query_budget(4)
 def index(request):
     posts = Post.objects.select_related('group', 'author').all()
     context = {
         'page_obj': split_pages(posts, request),
     }
-    return render(request, 'posts/index.html', context)
+    response = render(request, 'posts/index.html', context)
+    return tag(request, response, INDEX_FEED,
+               *page_keys(context['page_obj']))
 
 
+@use_replica
+@query_budget(5)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
     posts = group.posts.select_related("author", "group")
@@ -25,12 +50,19 @@ def group_posts(request, slug):
         'group': group,
         'page_obj': split_pages(posts, request),
     }
-    return render(request, 'posts/group_list.html', context)
+    response = render(request, 'posts/group_list.html', context)
+    return tag(request, response, f'group-{group.pk}',
+               feed_key('group', group.pk), *page_keys(context['page_obj']))
 
 
+@use_replica
+@query_budget(7)
 def profile(request, username):
     author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
+    posts = TieredPosts(
+        author.posts.select_related('author', 'group'),
+        author.archived_posts.select_related('author', 'group'),
+    )
     user = request.user
     following = (request.user.is_authenticated
                  and author.following.filter(user=user).exists())
@@ -41,32 +73,72 @@ def profile(request, username):
         "following": following
     }
     template = 'posts/profile.html'
-    return render(request, template, context)
+    response = render(request, template, context)
+    return tag(request, response, f'author-{author.pk}',
+               feed_key('author', author.pk), *page_keys(context['page_obj']))
 
 
+def comments_page(request, post, cursor_param):
+    order = request.GET.get('order')
+    if order not in COMMENT_ORDERINGS:
+        order = 'oldest'
+    paginator = CursorPaginator(
+        post.comments.select_related('author'),
+        settings.COMMENTS_PER_PAGE,
+        COMMENT_ORDERINGS[order]
+    )
+    try:
+        page = paginator.page(request.GET.get(cursor_param))
+    except InvalidCursor:
+        page = paginator.page()
+    return {'comments': page, 'comments_order': order}
+
+
+@use_replica
+@query_budget(6)
 def post_detail(request, post_id):
-    post = get_object_or_404(
-        Post.objects.select_related('group', 'author'), pk=post_id)
+    post = get_post_or_404(post_id, 'group', 'author')
     form = CommentForm()
-    comments = post.comments.all()
     following = (
         request.user.is_authenticated
         and Follow.objects.filter(
             user=request.user, author=post.author
         ).exists()
     )
+    pending = []
+    if (settings.COMMENT_WRITE_BEHIND and request.user.is_authenticated
+            and not post.archived):
+        pending = pending_comments(post.id, request.user)
     context = {'post': post,
                'form': form,
-               'comments': comments,
-               "following": following}
-    return render(request, 'posts/post_detail.html', context)
+               "following": following,
+               'pending_comments': pending,
+               **comments_page(request, post, 'comments')}
+    response = render(request, 'posts/post_detail.html', context)
+    # Feed-ключ автора: на странице число его постов.
+    return tag(request, response, *surrogate_keys(post),
+               feed_key('author', post.author_id))
+
+
+@use_replica
+@query_budget(2)
+def post_comments(request, post_id):
+    post = get_post_or_404(post_id)
+    context = {'post': post, **comments_page(request, post, 'cursor')}
+    response = render(request, 'posts/includes/comment_list.html', context)
+    return tag(request, response, f'post-{post.pk}')
 
 
 @login_required
+@query_budget(3)
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
-    if form.is_valid():
+    if not form.is_valid():
+        return redirect('posts:post_detail', post_id=post_id)
+    if settings.COMMENT_WRITE_BEHIND:
+        enqueue_comment(post, request.user, form.cleaned_data['text'])
+    else:
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
@@ -75,6 +147,7 @@ def add_comment(request, post_id):
 
 
 @login_required
+@query_budget(4)
 def post_create(request):
     template = "posts/create_post.html"
     form = PostForm(request.POST or None,
@@ -88,7 +161,42 @@ def post_create(request):
     return redirect("posts:profile", username=request.user)
 
 
+@query_budget(1)
+def group_autocomplete(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'results': []})
+    # Поиск по title зависит от регистра запроса — ключ по нему как есть.
+    key = versioned_key(GROUPS, 'autocomplete', query)
+    results = cache.get(key)
+    if results is None:
+        groups = Group.objects.filter(
+            prefix_range('title', query)
+            | prefix_range('title', query.capitalize())
+            | prefix_range('slug', query.lower())
+        ).order_by('title').values('id', 'title')
+        results = [
+            {'id': group['id'], 'text': group['title']}
+            for group in groups[:settings.GROUP_AUTOCOMPLETE_LIMIT]
+        ]
+        cache.set(key, results, settings.GROUP_AUTOCOMPLETE_TIMEOUT)
+    return JsonResponse({'results': results})
+
+
+@query_budget(0)
+def events(request):
+    post_id = request.GET.get('post', '')
+    response = StreamingHttpResponse(
+        event_stream(int(post_id) if post_id.isdigit() else None),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
+@query_budget(6)
 def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     if post.author != request.user:
@@ -109,17 +217,19 @@ def post_edit(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@use_replica
 @login_required
+@query_budget(2)
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(post_list, settings.NUM_POSTS)
-    page_obj = split_pages(post_list, request)
-    context = {'page_obj': page_obj,
-               'paginator': paginator}
+    post_list = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('author', 'group')
+    context = {'page_obj': split_pages(post_list, request)}
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
+@query_budget(6)
 def profile_follow(request, username):
     user = request.user
     author = get_object_or_404(User, username=username)
@@ -129,9 +239,89 @@ def profile_follow(request, username):
 
 
 @login_required
+@query_budget(4)
 def profile_unfollow(request, username):
     user = request.user
     author = get_object_or_404(User, username=username)
-    if Follow.objects.filter(user=user, author=author).exists():
-        Follow.objects.filter(user=user, author=author).delete()
+    Follow.objects.filter(user=user, author=author).delete()
     return redirect('posts:profile', username=username)
+
+
+def month_page(request, scope, year, month, load):
+    """Страница месяца; завершённые месяцы отдаются с диска.
+
+    Отрисованная для анонима страница завершённого месяца с постами
+    пишется в ARCHIVE_PAGES_DIR вместе с Surrogate-Key и дальше
+    читается оттуда без запросов к базе, с публичным Cache-Control на
+    ARCHIVE_PAGE_MAX_AGE. Пустые месяцы не сохраняются: иначе обход
+    любых годов забил бы диск.
+    Вошедшим пользователям страница рисуется как обычно: в ней их имя
+    и меню.
+    """
+    start, end = month_bounds(year, month)
+    number = request.GET.get('page', '1')
+    path = None
+    if (is_complete(end) and number.isdigit()
+            and not request.user.is_authenticated):
+        path = page_path(scope, year, month, int(number))
+        saved = read_page(path)
+        if saved is not None:
+            keys, content = saved
+            return cache_publicly(tag(request, HttpResponse(content), *keys))
+    context, hot, archived, feed = load()
+    posts = TieredPosts(
+        hot.filter(pub_date__gte=start, pub_date__lt=end)
+        .select_related('author', 'group'),
+        archived.filter(pub_date__gte=start, pub_date__lt=end)
+        .select_related('author', 'group'),
+    )
+    previous, following = neighbours(year, month)
+    context.update({
+        'page_obj': split_pages(posts, request),
+        'month': start,
+        'previous': previous,
+        'following': following,
+    })
+    response = render(request, 'posts/archive_month.html', context)
+    page = context['page_obj']
+    keys = [feed, *page_keys(page)]
+    tag(request, response, *keys)
+    # Пока архивация не забрала все посты месяца, их ещё можно править.
+    if (path and page.paginator.count and not posts.hot_count()
+            and page.number == int(number)):
+        save_page(path, keys, response.content)
+        cache_publicly(response)
+    return response
+
+
+def cache_publicly(response):
+    patch_cache_control(response, public=True,
+                        max_age=settings.ARCHIVE_PAGE_MAX_AGE)
+    return response
+
+
+@query_budget(6)
+def archive_month(request, year, month):
+    return month_page(request, ['site'], year, month, lambda: (
+        {}, Post.objects, ArchivedPost.objects, INDEX_FEED
+    ))
+
+
+@query_budget(7)
+def group_archive(request, slug, year, month):
+    def load():
+        group = get_object_or_404(Group, slug=slug)
+        return ({'group': group}, group.posts, group.archived_posts,
+                feed_key('group', group.pk))
+    return month_page(request, ['group', slug], year, month, load)
+
+
+@query_budget(7)
+def profile_archive(request, username, year, month):
+    def load():
+        author = get_object_or_404(User, username=username)
+        return ({'author': author}, author.posts, author.archived_posts,
+                feed_key('author', author.pk))
+    # С префиксом имя пользователя '..' не выходит из каталога.
+    return month_page(request, ['author', f'@{username}'], year, month,
+                      load)
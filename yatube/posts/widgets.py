@@ -0,0 +1,37 @@
+from django import forms
+from django.urls import reverse_lazy
+
+
+class GroupAutocompleteWidget(forms.Select):
+    """Выпадающий список групп, который не выгружает все группы.
+
+    В HTML попадает только выбранная группа, остальные варианты
+    подгружаются скриптом из posts:group_autocomplete по мере ввода.
+    """
+
+    class Media:
+        js = ('js/group_autocomplete.js',)
+
+    def __init__(self, attrs=None):
+        attrs = {
+            'data-autocomplete-url': reverse_lazy('posts:group_autocomplete'),
+            **(attrs or {}),
+        }
+        super().__init__(attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(
+                name, '', self.choices.field.empty_label,
+                not any(value), 0, attrs=attrs
+            ))
+        selected = [pk for pk in value if str(pk).isdigit()]
+        if selected:
+            queryset = self.choices.queryset.filter(pk__in=selected)
+            for group in queryset:
+                options.append(self.create_option(
+                    name, group.pk, str(group), True, len(options),
+                    attrs=attrs
+                ))
+        return [(None, [option], option['index']) for option in options]
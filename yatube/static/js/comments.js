@@ -0,0 +1,19 @@
+(function () {
+  'use strict';
+
+  var container = document.getElementById('comments');
+  if (!container || !window.fetch) {
+    return;
+  }
+  container.addEventListener('click', function (event) {
+    var link = event.target.closest('[data-fragment-url]');
+    if (!link) {
+      return;
+    }
+    event.preventDefault();
+    var more = link.closest('[data-comments-more]');
+    fetch(link.getAttribute('data-fragment-url'))
+      .then(function (response) { return response.text(); })
+      .then(function (html) { more.outerHTML = html; });
+  });
+})();
@@ -0,0 +1,50 @@
+(function () {
+  'use strict';
+
+  function attach(select) {
+    var url = select.getAttribute('data-autocomplete-url');
+    var search = document.createElement('input');
+    var timer = null;
+    search.type = 'search';
+    search.className = 'form-control mb-2';
+    search.placeholder = 'Начните вводить название группы';
+    select.parentNode.insertBefore(search, select);
+
+    function render(results) {
+      var current = select.value;
+      Array.prototype.slice.call(select.options).forEach(function (option) {
+        if (option.value && option.value !== current) {
+          select.removeChild(option);
+        }
+      });
+      results.forEach(function (group) {
+        if (String(group.id) === current) {
+          return;
+        }
+        var option = document.createElement('option');
+        option.value = group.id;
+        option.textContent = group.text;
+        select.appendChild(option);
+      });
+    }
+
+    search.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var query = search.value.trim();
+        if (!query) {
+          render([]);
+          return;
+        }
+        fetch(url + '?q=' + encodeURIComponent(query))
+          .then(function (response) { return response.json(); })
+          .then(function (data) { render(data.results); });
+      }, 200);
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    var selects = document.querySelectorAll('select[data-autocomplete-url]');
+    Array.prototype.forEach.call(selects, attach);
+  });
+})();
@@ -0,0 +1,24 @@
+(function () {
+  'use strict';
+
+  var banner = document.querySelector('[data-events-url]');
+  if (!banner || !window.EventSource) {
+    return;
+  }
+  var link = banner.querySelector('a');
+  var comments = 0;
+  var source = new EventSource(banner.getAttribute('data-events-url'));
+
+  function show(text) {
+    link.textContent = text;
+    banner.classList.remove('d-none');
+  }
+
+  source.addEventListener('posts', function (event) {
+    show('Новых постов: ' + JSON.parse(event.data).count + '. Обновить');
+  });
+  source.addEventListener('comment', function () {
+    comments += 1;
+    show('Новых комментариев: ' + comments + '. Обновить');
+  });
+})();
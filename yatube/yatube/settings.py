@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -17,6 +18,7 @@ INSTALLED_APPS = [
     'core.apps.CoreConfig',  # Добавленная запись Спринт 4
     'users.apps.UsersConfig',  # Добавленная запись Спринт 4
     'posts.apps.PostsConfig',  # Добавленная запись Спринт 3
+    'api.apps.ApiConfig',
     'sorl.thumbnail',          # Добавленная запись Спринт 6
     'django.contrib.admin',
     'django.contrib.auth',
@@ -27,11 +29,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.SlowQueryContextMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,10 +67,64 @@ WSGI_APPLICATION = 'yatube.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+    },
+    # Реплика для чтения; локально её наполняет manage.py replicate.
+    'replica': {
+        'ENGINE': 'core.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+# Приложение -> alias базы (core.db_router.AppDatabaseRouter).
+DATABASE_APPS = {}
+
+# Профиль split: сессии, kvstore sorl и таблицы кеша в своих файлах.
+# Миграции: manage.py migrate --database <alias> для каждого alias,
+# таблица кеша: createcachetable --database cache.
+if os.environ.get('YATUBE_DB_PROFILE') == 'split':
+    DATABASE_APPS = {
+        'sessions': 'sessions',
+        'thumbnail': 'kvstore',
+        'django_cache': 'cache',
     }
+    for alias in sorted(set(DATABASE_APPS.values())):
+        DATABASES[alias] = {
+            'ENGINE': 'core.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, f'db_{alias}.sqlite3'),
+            'CONN_MAX_AGE': 60,
+        }
+
+DATABASE_ROUTERS = [
+    'core.db_router.AppDatabaseRouter',
+    'core.db_router.ReplicaRouter',
+]
+
+# Чтения view с use_replica уходят на REPLICAS; после записи браузер
+# PIN_SECONDS читает с primary. Включается YATUBE_USE_REPLICA=1 при
+# запущенном manage.py replicate --follow.
+REPLICA_ROUTING = {
+    'ENABLED': bool(os.environ.get('YATUBE_USE_REPLICA')),
+    'REPLICAS': ['replica'],
+    'PIN_SECONDS': 5,
+    'PIN_COOKIE': 'pin_primary',
+}
+
+# Выполняются на каждом новом соединении core.backends.sqlite3;
+# проверить эффект: manage.py sqlite_benchmark
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
 }
+SQLITE_OPTIMIZE_INTERVAL = 3600
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -97,6 +158,21 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
+# cached_db читает сессию из кеша, в базу только пишет; совсем без
+# базы — YATUBE_SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies
+SESSION_ENGINE = os.environ.get(
+    'YATUBE_SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+
+# Пользователь запроса из кеша (core.auth.CachedAuthenticationMiddleware).
+# Включать (YATUBE_AUTH_CACHE=1) только с общим для процессов кешем:
+# с LocMem из CACHES другие процессы после смены пароля или блокировки
+# до TIMEOUT секунд принимают старую сессию.
+AUTH_CACHE = {
+    'ENABLED': bool(os.environ.get('YATUBE_AUTH_CACHE')),
+    'TIMEOUT': 300,
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
@@ -107,8 +183,161 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache_backends.InstrumentedLocMemCache',
     }
 }
 
+# Server-Timing и лог yatube.performance по каждому запросу
+PERFORMANCE_INSTRUMENTATION = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,
+}
+
+# Журнал медленных SQL-запросов; отчёт: manage.py slow_queries
+SLOW_QUERY_LOG = {
+    'ENABLED': False,
+    'THRESHOLD_MS': 100,
+    'EXPLAIN': True,
+    'PATH': os.path.join(BASE_DIR, 'logs', 'slow_queries.jsonl'),
+}
+
+# Бюджеты SQL-запросов view (core.query_budget): превышение пишется
+# в лог, а при RAISE — исключение. IGNORE — подстроки SQL, которые не
+# считаются: здесь разовый прогрев хранилища миниатюр sorl.
+QUERY_BUDGET = {
+    'ENABLED': True,
+    'RAISE': DEBUG,
+    'IGNORE': ['thumbnail_kvstore'],
+}
+
+# Метрики Prometheus на /metrics. DIR — общий для всех воркеров
+# каталог (лучше tmpfs), очищать при каждом перезапуске сервиса.
+# С TOKEN доступ только с заголовком Authorization: Bearer <TOKEN>
+# (bearer_token в Prometheus); без него — с ALLOWED_IPS напрямую, не
+# через прокси. За обратным прокси задайте TOKEN.
+METRICS = {
+    'ENABLED': False,
+    'DIR': os.path.join(tempfile.gettempdir(), 'yatube-metrics'),
+    'ALLOWED_IPS': ['127.0.0.1', '::1'],
+    'TOKEN': os.environ.get('YATUBE_METRICS_TOKEN', ''),
+}
+
+# Профилирование запроса персоналом: ?_profile=top|collapsed или
+# заголовок X-Profile. INTERVAL — шаг сэмплера в секундах.
+PROFILING = {
+    'ENABLED': False,
+    'PARAM': '_profile',
+    'HEADER': 'X-Profile',
+    'INTERVAL': 0.001,
+    'TOP': 40,
+    'DIR': os.path.join(BASE_DIR, 'logs', 'profiles'),
+}
+
+# Время {% include %}, тегов и фильтров по шаблонам; отчёт:
+# manage.py template_profile. Включает заметные накладные расходы.
+TEMPLATE_PROFILER = {
+    'ENABLED': False,
+    'DIR': os.path.join(BASE_DIR, 'logs', 'template_profile'),
+    'DUMP_INTERVAL': 10,
+}
+
+# manage.py benchmark: baseline и допуск по задержке и rps (доля).
+# Число запросов в baseline из репозитория не зависит от машины и
+# проверяется тестами; задержки и rps в нём сняты на одной машине —
+# перед сравнением по времени запишите свой: --save-baseline (или
+# сравнивайте с --queries-only).
+BENCHMARK = {
+    'BASELINE': os.path.join(BASE_DIR, 'benchmarks', 'baseline.json'),
+    'TOLERANCE': 0.25,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'yatube': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 NUM_POSTS = 10
+COMMENTS_PER_PAGE = 20
+
+# Отложенная запись комментариев: add_comment кладёт их в локальную
+# очередь, а в базу пачками пишет `manage.py flush_comments --loop`.
+COMMENT_WRITE_BEHIND = False
+COMMENT_QUEUE_DIR = os.path.join(BASE_DIR, 'queue')
+COMMENT_FLUSH_BATCH = 500
+
+# Посты старше ARCHIVE_AGE_DAYS с комментариями переносит в архивные
+# таблицы `manage.py archive_posts` (запускать по расписанию).
+ARCHIVE_AGE_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+# Страницы /archive/<год>/<месяц>/ полностью архивных месяцев:
+# отрисовываются один раз и отдаются с диска; правка видимых полей
+# группы или пользователя удаляет задачей страницы с их постами.
+ARCHIVE_PAGES_DIR = os.path.join(BASE_DIR, 'archive_pages')
+ARCHIVE_PAGE_MAX_AGE = 60 * 60 * 24
+
+# Фоновые задачи core.tasks; выполняет `manage.py run_tasks --loop`
+TASKS = {
+    'EAGER': False,
+    'DIR': os.path.join(BASE_DIR, 'queue'),
+}
+
+# Готовые страницы для анонимов (posts.prerender): index, группы,
+# профили и посты пишутся в DIR и перерисовываются задачами при
+# изменениях. Первое заполнение: manage.py prerender --all.
+PRERENDER = {
+    'ENABLED': False,
+    'DIR': os.path.join(BASE_DIR, 'prerendered'),
+    'HOST': 'localhost',
+}
+
+# Surrogate-Key для кеширующего прокси (core.surrogate): страницы
+# помечаются ключами постов, авторов, групп и лент, изменения моделей
+# сбрасывают ключи задачей run_tasks через BACKEND.
+SURROGATE_KEYS = {
+    'ENABLED': False,
+    'HEADER': 'Surrogate-Key',
+    'MAX_AGE': 60 * 60 * 24,
+    'BACKEND': 'core.surrogate.HTTPPurgeBackend',
+    'PURGE_URL': 'http://127.0.0.1:6081/',
+    'PURGE_METHOD': 'PURGE',
+    'PURGE_HEADER': 'Surrogate-Key',
+    'TIMEOUT': 5,
+}
+
+# Верхняя граница подсчёта строк в EstimatedCountPaginator
+ESTIMATED_COUNT_LIMIT = 10000
+
+API_PAGE_SIZE = 20
+API_BATCH_LIMIT = 100
+API_OBJECT_CACHE_TIMEOUT = 60 * 5
+
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Server-Sent Events: общий опрос журнала изменений
+EVENTS_POLL_INTERVAL = 1
+EVENTS_BATCH_SIZE = 500
+EVENTS_QUEUE_SIZE = 100
+EVENTS_KEEPALIVE = 15
+EVENTS_RETRY = 5
+EVENTS_MAX_AGE = 60 * 5
+
+# Long poll журнала изменений /api/v1/changes/
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_WAIT = 25
+CHANGES_KEEP_DAYS = 7
+
+GROUP_AUTOCOMPLETE_LIMIT = 10
+GROUP_AUTOCOMPLETE_TIMEOUT = 60 * 15